@@ -32,12 +32,19 @@
 # this program uses camel case: PySide6 uses camel case and consistency in
 # the notation type was preferred over pythonic habits.
 
-import sys, os, platform, shutil, glob
+import sys, os, platform, shutil, glob, re, gzip, hashlib, codecs, marshal, mmap
 import ctypes
 import subprocess
-from threading import Thread
+from threading import Thread, Lock, Event, get_ident
+import heapq
+from concurrent.futures import ThreadPoolExecutor, Future
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+from collections import OrderedDict, deque
+from urllib.parse import urljoin, urlsplit
 import queue
 import json
+import xml.etree.ElementTree as ET
 import time
 from datetime import datetime
 import locale
@@ -160,6 +167,8 @@ build = '260220'
 versionInfo = 'CyberTelly' + ' ' + version + ' ' + build
 installType = 'Python-Sourcecode'
 bugManager = None
+tvhClient = None
+httpClient = None
 
 # Sound profile definitions
 sndStandard = 'standard'
@@ -168,6 +177,12 @@ sndSpeech = 'treble'
 sndCinema = 'cinema'
 soundProfiles = [sndStandard, sndNews, sndSpeech, sndCinema]
 
+# Attributes of #EXTM3U and #EXTINF lines in m3u playlists, e.g. tvg-id="DasErste.de"
+m3uAttributes = re.compile(r'([\w-]+)="([^"]*)"')
+
+# Words of EPG titles, subtitles and descriptions for full-text search
+epgSearchWords = re.compile(r'\w+')
+
 # Import for MacOS to determine screen size
 # pip install pyobjc-framework-Quartz
 try:
@@ -190,6 +205,7 @@ statusQueue = queue.Queue()
 workerQueue = queue.Queue()
 bugQueue = queue.Queue()
 vlcWorker = None
+vlcClient = None
 
 def vlcWorkerFunction(cmdQueue, statusQueue, workerQueue, bugQueue):
     vlcInstance = None
@@ -199,6 +215,8 @@ def vlcWorkerFunction(cmdQueue, statusQueue, workerQueue, bugQueue):
 
     activeProfile = ''
     activeEqualizer = None
+    mediaKey = [0] # Key of media set by setMedia: Written by cmd loop, read by libvlc event threads
+    playerEventBridge = [None] # eventBridge of setupVlc: Volume events are emitted by the cmd loop
     # SoundMatrix: { 'key': [B0,   B1,    B2,    B3,    B4,   B5,   B6,   B7,    B8,    B9],    Preamp }
     # Frequencies / Preamp: [60Hz, 170Hz, 310Hz, 600Hz, 1kHz, 3kHz, 6kHz, 12kHz, 14kHz, 16kHz], (200%=6.02 225%=7.04 250%=7.96) }
     soundProfileMatrix = {
@@ -208,7 +226,7 @@ def vlcWorkerFunction(cmdQueue, statusQueue, workerQueue, bugQueue):
         sndCinema:   ([10.0, 6.0, 0.0, -5.0, -7.0, -5.0, 0.0, 4.0, 7.0, 10.0], 6.02)
     }
 
-    def setupVlc(winID, vlcArgs, errorType):
+    def setupVlc(winID, vlcArgs, errorType, eventBridge=None):
         global activeEqualizer
         vlcInstance = None
         mediaPlayer = None
@@ -246,8 +264,42 @@ def vlcWorkerFunction(cmdQueue, statusQueue, workerQueue, bugQueue):
                     mediaPlayer.set_nsobject(winID)
             except:
                 bugQueue.put([errorType,'setupVlc: Error setting VLC videoframe', True])
+            # Forward player events to the GUI thread
+            try:
+                if eventBridge != None:
+                    playerEventBridge[0] = eventBridge
+                    attachPlayerEvents(mediaPlayer, eventBridge, errorType)
+            except:
+                bugQueue.put([errorType,'setupVlc: Error attaching player events', True])
         return vlcInstance, mediaPlayer, vlcSetupOk, errorType
 
+    # Player events are emitted by eventBridge.playerEvent(media key, event, value):
+    # ('state', vlc.State), ('buffering', percent), ('volume', volume 0..200 of audio_get_volume)
+    # Callbacks run in libvlc threads and must not call libvlc functions, so they only forward the event
+    # Volume changes are passed to the cmd loop, which reads the volume from the player ('volumeChanged')
+    def attachPlayerEvents(mediaPlayer, eventBridge, errorType):
+        stateEvents = {
+            vlc.EventType.MediaPlayerOpening: vlc.State.Opening,
+            vlc.EventType.MediaPlayerPlaying: vlc.State.Playing,
+            vlc.EventType.MediaPlayerPaused: vlc.State.Paused,
+            vlc.EventType.MediaPlayerStopped: vlc.State.Stopped,
+            vlc.EventType.MediaPlayerEndReached: vlc.State.Ended,
+            vlc.EventType.MediaPlayerEncounteredError: vlc.State.Error
+        }
+        def playerEvent(event):
+            try:
+                if event.type in stateEvents:
+                    eventBridge.playerEvent.emit(mediaKey[0], 'state', stateEvents[event.type])
+                elif event.type == vlc.EventType.MediaPlayerBuffering:
+                    eventBridge.playerEvent.emit(mediaKey[0], 'buffering', event.u.new_cache)
+                elif event.type == vlc.EventType.MediaPlayerAudioVolume:
+                    cmdQueue.put(['volumeChanged', mediaKey[0]])
+            except:
+                bugQueue.put([errorType,'playerEvent: Error forwarding event', False, True])
+        eventManager = mediaPlayer.event_manager()
+        for eventType in list(stateEvents.keys()) + [vlc.EventType.MediaPlayerBuffering, vlc.EventType.MediaPlayerAudioVolume]:
+            eventManager.event_attach(eventType, playerEvent)
+
     def getInfo(infoTyp=''):
         result = None
         if infoTyp == 'vlcSetupOk':
@@ -280,45 +332,159 @@ def vlcWorkerFunction(cmdQueue, statusQueue, workerQueue, bugQueue):
         return eq, activeEqualizer
     
     # VLC Worker main
+    # Queue items: [cmd, args...], ['batch', [[cmd, args...], ...]] or ['request', requestId, [cmd, args...]]
+    # Requests are answered on statusQueue with [requestId, ok, result] (see VlcCommandClient)
     cmd = ''
     while cmd != 'exit':
+        queueData = cmdQueue.get()
+        requestId = None
+        if queueData[0] == 'batch':
+            cmdList = queueData[1]
+        elif queueData[0] == 'request':
+            requestId = queueData[1]
+            cmdList = [queueData[2]]
+        else:
+            cmdList = [queueData]
+        result = None
+        ok = True
+        for queueData in cmdList:
+            try:
+                cmd = queueData[0]
+                if cmd == 'checkAlive':
+                    workerQueue.put(['isAlive'])
+                elif cmd == 'getInfo':
+                    result = getInfo(queueData[1])
+                elif cmd == 'setMedia':
+                    url = queueData[1]
+                    if len(queueData) > 3:
+                        mediaKey[0] = queueData[3]
+                    media = vlcInstance.media_new(url)
+                    for option in (queueData[2] if len(queueData) > 2 else []): # #EXTVLCOPT of m3u playlist
+                        media.add_option(':' + option)
+                    mediaPlayer.set_media(media)
+                elif cmd == 'setEqualizer':
+                    if activeProfile != queueData[1]:
+                        equalizer, freeEqualizer = createEqualizer(profileName=queueData[1])
+                        if equalizer:
+                            activeEqualizer = equalizer
+                            mediaPlayer.set_equalizer(activeEqualizer)
+                            vlc.libvlc_audio_equalizer_release(freeEqualizer)
+                            activeProfile = queueData[1]
+                elif cmd == 'play':
+                    mediaPlayer.play()
+                    workerQueue.put(['play',queueData[1]])
+                elif cmd == 'stop':
+                    mediaPlayer.stop()
+                elif cmd == 'volumeChanged':
+                    # Sent by playerEvent: Volume of the media is forwarded unless the media has changed meanwhile
+                    volume = mediaPlayer.audio_get_volume()
+                    if queueData[1] == mediaKey[0] and volume != -1 and playerEventBridge[0] != None:
+                        playerEventBridge[0].playerEvent.emit(queueData[1], 'volume', volume)
+                elif cmd == 'setVolume':
+                    volume = queueData[1]
+                    if mediaPlayer.get_state() == vlc.State.Playing:
+                        mediaPlayer.audio_set_volume(volume*2)
+                elif cmd == 'setupVlc':
+                    vlcInstance, mediaPlayer, vlcSetupOk, vlcErrorType = setupVlc(queueData[1], queueData[2], queueData[3], queueData[4] if len(queueData) > 4 else None)
+                elif cmd == 'exit':
+                    if activeEqualizer:
+                        vlc.libvlc_audio_equalizer_release(activeEqualizer)
+                    break
+            except:
+                ok = False
+                bugQueue.put([vlcErrorType,'cmdLoop: Error handling cmd ' + str(cmd), True])
+        if requestId != None:
+            statusQueue.put([requestId, ok, result])
+
+# VLC Worker client: Typed access to the command protocol of vlcWorkerFunction
+#   send(cmd, args...): Fire-and-forget. Commands sent during one GUI event loop cycle go to cmdQueue as one batch,
+#                       consecutive setVolume/setEqualizer commands are coalesced to the last one
+#   request(cmd, args...): Returns a Future resolved with the worker's result. Pending sends are flushed first to keep the order
+#   call(cmd, args..., timeout, default): Blocking request returning default on timeout or error
+# Replies are routed to their Future by request id, so a caller never reads a reply meant for someone else
+class VlcCommandClient():
+    def __init__(self, cmdQueue, statusQueue):
+        self.cmdQueue = cmdQueue
+        self.statusQueue = statusQueue
+        self.coalescedCmds = ('setVolume', 'setEqualizer')
+        self.lock = Lock()
+        self.batch = []
+        self.pending = {} # request id: Future
+        self.lastRequestId = 0
+        self.router = Thread(target=self.routeReplies, daemon=True)
+        self.router.start()
+
+    # Queue fire-and-forget command: Flushed at the next GUI event loop cycle or by request/flush
+    def send(self, cmd, *args):
+        with self.lock:
+            if len(self.batch) > 0 and cmd in self.coalescedCmds and self.batch[-1][0] == cmd:
+                self.batch[-1] = [cmd, *args]
+            else:
+                self.batch.append([cmd, *args])
+            startFlush = len(self.batch) == 1
+        if startFlush:
+            QtCore.QTimer.singleShot(0, self.flush)
+
+    # Put queued commands on cmdQueue
+    def flush(self):
+        with self.lock:
+            self.flushBatch()
+
+    # Put queued commands on cmdQueue: self.lock must be held
+    def flushBatch(self):
+        if len(self.batch) == 1:
+            self.cmdQueue.put(self.batch[0])
+        elif len(self.batch) > 1:
+            self.cmdQueue.put(['batch', self.batch])
+        self.batch = []
+
+    # Send request and return Future for the result
+    def request(self, cmd, *args):
+        future = Future()
+        with self.lock:
+            self.lastRequestId += 1
+            future.requestId = self.lastRequestId
+            self.pending[future.requestId] = future
+            self.flushBatch()
+            self.cmdQueue.put(['request', future.requestId, [cmd, *args]])
+        return future
+
+    # Send request and wait for the result: A reply arriving after the timeout is discarded
+    def call(self, cmd, *args, timeout=1.0, default=None):
+        future = self.request(cmd, *args)
         try:
-            queueData = ['']
-            queueData = cmdQueue.get()
-            cmd = queueData[0]
-            if cmd == 'checkAlive':
-                workerQueue.put(['isAlive'])
-            elif cmd == 'getInfo':
-                statusQueue.put(getInfo(queueData[1]))
-            elif cmd == 'setMedia':
-                url = queueData[1]
-                media = vlcInstance.media_new(url)
-                mediaPlayer.set_media(media)
-            elif cmd == 'setEqualizer':
-                if activeProfile != queueData[1]:
-                    equalizer, freeEqualizer = createEqualizer(profileName=queueData[1])
-                    if equalizer:
-                        activeEqualizer = equalizer
-                        mediaPlayer.set_equalizer(activeEqualizer)
-                        vlc.libvlc_audio_equalizer_release(freeEqualizer)
-                        activeProfile = queueData[1]
-            elif cmd == 'play':
-                mediaPlayer.play()
-                workerQueue.put(['play',queueData[1]])
-            elif cmd == 'stop':
-                mediaPlayer.stop()
-            elif cmd == 'setVolume':
-                volume = queueData[1]
-                if mediaPlayer.get_state() == vlc.State.Playing:
-                    mediaPlayer.audio_set_volume(volume*2)
-            elif cmd == 'setupVlc':
-                vlcInstance, mediaPlayer, vlcSetupOk, vlcErrorType = setupVlc(queueData[1], queueData[2], queueData[3])
-            elif cmd == 'exit':
-                if activeEqualizer:
-                    vlc.libvlc_audio_equalizer_release(activeEqualizer)
-        except:
-            bugQueue.put([vlcErrorType,'cmdLoop: Error handling cmd ' + cmd, True])
-    
+            return future.result(timeout=timeout)
+        except:
+            with self.lock:
+                self.pending.pop(future.requestId, None)
+            return default
+
+    # Router thread: Resolve Future of each reply [requestId, ok, result] on statusQueue
+    def routeReplies(self):
+        while True:
+            try:
+                reply = self.statusQueue.get()
+                if reply == None:
+                    break
+                requestId, ok, result = reply
+                with self.lock:
+                    future = self.pending.pop(requestId, None)
+                if future != None:
+                    if ok:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(RuntimeError('vlcWorker: Request ' + str(requestId) + ' failed'))
+            except:
+                bugQueue.put([bugManager.vlcCommands, 'routeReplies: Error routing reply', False, True])
+
+    # Send remaining commands and stop router thread
+    def shutdown(self):
+        self.flush()
+        self.statusQueue.put(None)
+
+# Signals of VLC player events (see attachPlayerEvents): Emitted in libvlc threads, received in the GUI thread
+class VlcEventBridge(QtCore.QObject):
+    playerEvent = QtCore.Signal(int, str, object) # media key, event, value
 
 # Main program window
 class Window(QtWidgets.QMainWindow):
@@ -395,6 +561,9 @@ class Window(QtWidgets.QMainWindow):
             self.actionVolumeControl.setIcon(volumeControlIcon)
             self.actionVolumeControl.setMenuRole(QtGui.QAction.MenuRole.NoRole)
 
+            self.actionSearchEpg = QtGui.QAction(self)
+            self.actionSearchEpg.setMenuRole(QtGui.QAction.MenuRole.NoRole)
+
             self.actionToggleVolumeMuted = QtGui.QAction(self)
             self.actionToggleVolumeMuted.setObjectName(u"actionToggleVolumeMuted")
             self.actionToggleVolumeMuted.setCheckable(True)
@@ -481,6 +650,7 @@ class Window(QtWidgets.QMainWindow):
             self.shortcutAbout = QtGui.QShortcut(QtGui.QKeySequence('Ctrl+I'), self)
             self.shortcutToolbarOnOff = QtGui.QShortcut(QtGui.QKeySequence('Ctrl+T'), self)
             self.shortcutAspectRatio16x9 = QtGui.QShortcut(QtGui.QKeySequence('Ctrl+9'), self)
+            self.shortcutSearchEpg = QtGui.QShortcut(QtGui.QKeySequence('Ctrl+F'), self)
             bugManager.pop(bugManager.mainProgram)
 
             # Connect signals and slots
@@ -492,6 +662,8 @@ class Window(QtWidgets.QMainWindow):
             self.shortcutPlay.activated.connect(self.play)
             self.actionStop.triggered.connect(self.stop)
             self.shortcutStop.activated.connect(self.stop)
+            self.actionSearchEpg.triggered.connect(self.showEpgSearch)
+            self.shortcutSearchEpg.activated.connect(self.showEpgSearch)
             # -- Soundmanager: Volume control
             self.actionVolumeControl.triggered.connect(self.setVolume)
             self.shortcutVolumeControl.activated.connect(self.setVolume)        
@@ -559,6 +731,7 @@ class Window(QtWidgets.QMainWindow):
             self.context.addAction(self.actionStop)
             self.context.addAction(self.actionPlay)
             self.context.addAction(self.actionVolumeControl)
+            self.context.addAction(self.actionSearchEpg)
             self.context.addSeparator()
             self.viewMenu = self.context.addMenu('Ansicht')
             self.viewMenu.setFont(font)
@@ -593,6 +766,7 @@ class Window(QtWidgets.QMainWindow):
             self.lbPlayError = QtWidgets.QLabel(parent=self.centralwidget)
             self.lbVlcCursorFix = QtWidgets.QLabel(parent=self.centralwidget)
             self.lbVlcBusy = QtWidgets.QLabel(parent=self.centralwidget)
+            self.lbChannelLogo = QtWidgets.QLabel(parent=self.centralwidget)
             # -- Configuration VLC Busy Pixmaps
             self.busyImage1 = QtGui.QPixmap(os.path.join(resourcePath,"Busy1.png"))
             self.busyImage2 = QtGui.QPixmap(os.path.join(resourcePath,"Busy2.png"))
@@ -626,11 +800,17 @@ class Window(QtWidgets.QMainWindow):
             self.lbVlcBusy.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
             self.lbVlcBusy.setMouseTracking(True)
             self.lbVlcBusy.hide()
+            # -- Configuration indicator label lbChannelLogo: Logo of channel after switching channel (see VideoManager.showChannelLogo)
+            self.lbChannelLogo.setText("")
+            self.lbChannelLogo.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
+            self.lbChannelLogo.setMouseTracking(True)
+            self.lbChannelLogo.hide()
             # -- Create indicatorDic
             self.indicatorDic = {'lbMuted': self.lbMuted, 
                                  'lbPageLogo': self.lbPageLogo, 'pageLogoVisible': True, 
                                  'lbPlayError': self.lbPlayError, 
-                                 'lbVlcBusy': self.lbVlcBusy, 'busyImages': [self.busyImage1, self.busyImage2, self.busyImage3, self.busyImage4,]}
+                                 'lbVlcBusy': self.lbVlcBusy, 'busyImages': [self.busyImage1, self.busyImage2, self.busyImage3, self.busyImage4,],
+                                 'lbChannelLogo': self.lbChannelLogo}
             
             # Configuration label lbVlcCursorFix
             # lbVlcCursorFix masks videoFrame at cursor position to avoid cursor Windows issues
@@ -738,6 +918,7 @@ class Window(QtWidgets.QMainWindow):
                 self.actionPlay.setToolTip(u"Streaming starten")
                 self.actionVolumeControl.setText(u"Lautstärke einstellen")
                 self.actionVolumeControl.setToolTip(u"Lautstärke einstellen")
+                self.actionSearchEpg.setText(u"Sendung suchen")
                 self.actionToggleVolumeMuted.setText(u"Audio aus")
                 self.actionToolbarOnOff.setText(u"Toolbar sichtbar")
                 self.actionSetAspectRatio16x9.setText(u"Bildformat 16:9")
@@ -770,6 +951,7 @@ class Window(QtWidgets.QMainWindow):
                 self.actionPlay.setToolTip(u"Start Streaming")
                 self.actionVolumeControl.setText(u"Set Volume")
                 self.actionVolumeControl.setToolTip(u"Set Volume")
+                self.actionSearchEpg.setText(u"Search Programme")
                 self.actionToggleVolumeMuted.setText(u"Audio muted")
                 self.actionToolbarOnOff.setText(u"Toolbar visible")
                 self.actionSetAspectRatio16x9.setText(u"Aspect Ratio 16:9")
@@ -800,8 +982,8 @@ class Window(QtWidgets.QMainWindow):
                     self.toolBarHeight = self.toolBar.size().height()
                 self.setIndicatorGeometry(errorType=bugManager.setupTimer)
                 if self.videoManager.vlcSetupOk:
-                    cmdQueue.put(['checkAlive'])
-                    cmdQueue.put(['checkAlive'])
+                    vlcClient.send('checkAlive')
+                    vlcClient.send('checkAlive')
                     self.vlcCheckAliveTimer.start()
                 else:
                     windowTitle = 'Programmfehler'
@@ -832,6 +1014,8 @@ class Window(QtWidgets.QMainWindow):
             self.lbMuted.setGeometry(QtCore.QRect(posX, posY, a, a))
             self.lbVlcBusy.setGeometry(QtCore.QRect(posX, posY+46,a,a))
             self.lbPlayError.setGeometry(QtCore.QRect(posX, posY+46,a,a))
+            # setGeometry: lbChannelLogo at top left corner
+            self.lbChannelLogo.setGeometry(QtCore.QRect(a//2, a//2, 4*a, 2*a))
             # setGeometry: lbPageLogo
             width = max(220,min(443,int(self.geometry().width() * 0.4)))
             height = int(width*235/443)
@@ -1176,23 +1360,10 @@ class Window(QtWidgets.QMainWindow):
                     mB = self.verticalLayout.contentsMargins().bottom()
                 chPos = QtCore.QPoint(chPos.x()+2*mL, chPos.y()+2*mT)
                 ph = ph - 2*mT - 2*mB
-                # Calculate VideoManager width
-                rows = self.videoManager.channelList.rowCount()
-                maxWidth = 0
-                txtRow = 0
-                for row in range(rows):
-                    textWidth = QtGui.QFontMetricsF(cyberTellyApp.font()).horizontalAdvance(self.videoManager.channelList.item(row,1).text())
-                    if textWidth > maxWidth:
-                        txtRow = row
-                        maxWidth = textWidth
+                # Calculate VideoManager width: Widest channel name is determined in setupVideoConfig
+                rows = self.videoManager.channelModel.rowCount()
                 if rows > 0:
-                    font = fitSansSerifFont2PxWidth(self.videoManager.channelList.item(txtRow,1).text(), self.videoManager.maxChannelListWidth)
-                    self.videoManager.setFont(font)
-                    c0Width = self.videoManager.channelList.sizeHintForColumn(0)
-                    c1Width = self.videoManager.channelList.sizeHintForColumn(1)
-                    frWidth = self.videoManager.channelList.frameWidth()
-                    sbWidth = self.videoManager.channelList.verticalScrollBar().sizeHint().width()
-                    newWidth = c0Width+c1Width+sbWidth+frWidth*2+10
+                    newWidth = self.videoManager.setChannelListFont()
                     # Set VideoManager geometry
                     if newWidth < self.videoManager.maxChannelListWidth:
                         self.videoManager.setGeometry(chPos.x(), chPos.y(), newWidth, ph)
@@ -1204,10 +1375,11 @@ class Window(QtWidgets.QMainWindow):
             except Exception as ex:
                 bugManager.setError(bugManager.mainProgram)
             if self.videoManager.videoManagerOk:
+                self.videoManager.clearChannelFilter()
                 self.videoManager.channelList.setFocus()
                 self.videoManager.showlbMessage(isVisible=False, errorType=bugManager.videoManager)
                 self.videoManager.show()
-                if self.videoManager.channelList.rowCount() == 0:
+                if self.videoManager.channelModel.rowCount() == 0:
                     self.videoManager.showlbMessage(errorType=bugManager.videoManager)
                 self.fixVlcCursorIssueTimer.start()
 
@@ -1360,7 +1532,7 @@ class Window(QtWidgets.QMainWindow):
                 if not vlcWorker.is_alive():
                     self.vlcCheckAliveTimer.stop()
             if self.vlcIsAliveCnt > -4314: # 4314 = 3*60*24-6 = 24h checkAlives; self.maxVlcIsAliveCnt=6; timer interval = 20s
-                cmdQueue.put(['checkAlive'])
+                vlcClient.send('checkAlive')
             bugManager.pop(bugManager.vlcCheckAliveTimer)
         except:
             bugManager.setError(bugManager.vlcCheckAliveTimer)
@@ -1383,6 +1555,23 @@ class Window(QtWidgets.QMainWindow):
             self.activeDialogs.append(helpDialog)
             self.fixVlcCursorIssueTimer.start()
 
+    # Show non modal EPG search dialog
+    def showEpgSearch(self):
+        if self.mainWindowOk:
+            searchDialog = EpgSearchDialog(self, epgManager=self.epgManager, language=self.configManager.getLanguage())
+            searchDialog.show()
+            self.activeDialogs.append(searchDialog)
+            self.fixVlcCursorIssueTimer.start()
+
+    # Play channel of EPG search result
+    def playEpgSearchResult(self, row):
+        if self.mainWindowOk:
+            bugManager.push(bugManager.videoManager,'MainWindow.playEpgSearchResult')
+            if 0 <= row < self.videoManager.channelModel.rowCount():
+                self.videoManager.selectRow(row)
+                self.videoManager.play(item=self.videoManager.channelModel.index(row,1), errorType=bugManager.videoManager)
+            bugManager.pop(bugManager.videoManager)
+
     # Show non modal about dialog
     def showProgInfo(self):
         if self.mainWindowOk:
@@ -1398,7 +1587,8 @@ class Window(QtWidgets.QMainWindow):
             # Close running VLC worker
             vlcWorkerError = False
             if vlcWorker.is_alive() and self.vlcIsAliveCnt == self.maxVlcIsAliveCnt:
-                cmdQueue.put(['exit'])
+                vlcClient.send('exit')
+                vlcClient.shutdown()
                 vlcWorker.join(2)
             else:
                 vlcWorkerError = True
@@ -1431,6 +1621,12 @@ class Window(QtWidgets.QMainWindow):
     def closeWindow(self):
         # Save settings
         if self.mainWindowOk:
+            # Shut down EPG, logo, probe and HLS worker pools
+            self.epgManager.shutdown()
+            self.videoManager.logoManager.shutdown()
+            self.videoManager.streamProber.shutdown()
+            self.videoManager.hlsResolver.shutdown()
+
             # Push VLC worker errors on error stack and close VLC Worker
             bugManager.pushBugQueue()
             self.closeVlcWorker()    
@@ -1468,6 +1664,7 @@ class ConfigManager():
             self.progPath = progPath
             self.configPath = configPath
             self.m3uPath = os.path.join(self.configPath, 'm3u')
+            self.remoteM3uPath = os.path.join(self.configPath, 'remote-m3u') # Local copies of m3u urls
             self.resourcePath = resourcePath
             bugManager.pop(bugManager.configManager)
 
@@ -1522,7 +1719,13 @@ class ConfigManager():
             'password': 'passw0rd'
         }
         config['m3uFile'] = 'IPTV-de-plus.m3u'
+        config['m3uFiles'] = ['IPTV-de-plus.m3u'] # Active playlists in priority order, m3uFile = first playlist
         config['soundProfile'] = sndStandard
+        config['tvhNotifications'] = True
+        config['channelLogos'] = True
+        config['channelGroups'] = True
+        config['streamProbe'] = True
+        config['hlsPrefetch'] = True
         return config
     
     # Read configuration from config.json with fallback initConfig
@@ -1630,6 +1833,9 @@ class ConfigManager():
                 if self.config['m3uFile'] != newConfig['m3uFile']:
                     self.config['m3uFile'] = newConfig['m3uFile']
                     self.configUpdated = True
+                if self.getM3uFiles() != newConfig['m3uFiles']:
+                    self.config['m3uFiles'] = newConfig['m3uFiles']
+                    self.configUpdated = True
                 if self.config['soundProfile'] != newConfig['soundProfile']:
                     self.config['soundProfile'] = newConfig['soundProfile']
                     self.configUpdated = True
@@ -1791,6 +1997,56 @@ class ConfigManager():
             bugManager.push(bugManager.configManager, 'getTvhServer Exception caught', setNotification=True)
         return server
     
+    # Get setting for push notifications of TVHServer (comet long poll)
+    def getTvhNotifications(self):
+        notifications = True
+        try:
+            notifications = self.config['tvhNotifications'] in [True, 1, 'true', 'True']
+        except:
+            notifications = True
+            self.config['tvhNotifications'] = True
+        return notifications
+
+    # Get setting: Show channel logos in channel list and after switching channel
+    def getChannelLogos(self):
+        channelLogos = True
+        try:
+            channelLogos = self.config['channelLogos'] in [True, 1, 'true', 'True']
+        except:
+            channelLogos = True
+            self.config['channelLogos'] = True
+        return channelLogos
+
+    # Get setting: Show channel groups (m3u: group-title, TVHeadend: channel tags) in channel list
+    def getChannelGroups(self):
+        channelGroups = True
+        try:
+            channelGroups = self.config['channelGroups'] in [True, 1, 'true', 'True']
+        except:
+            channelGroups = True
+            self.config['channelGroups'] = True
+        return channelGroups
+
+    # Get setting: Probe m3u stream urls in the background and show dead channels grey
+    def getStreamProbe(self):
+        streamProbe = True
+        try:
+            streamProbe = self.config['streamProbe'] in [True, 1, 'true', 'True']
+        except:
+            streamProbe = True
+            self.config['streamProbe'] = True
+        return streamProbe
+
+    # Get setting: Prefetch HLS master playlists of likely next channels and play the chosen variant directly
+    def getHlsPrefetch(self):
+        hlsPrefetch = True
+        try:
+            hlsPrefetch = self.config['hlsPrefetch'] in [True, 1, 'true', 'True']
+        except:
+            hlsPrefetch = True
+            self.config['hlsPrefetch'] = True
+        return hlsPrefetch
+
     # Get m3u path from configuration
     def getM3uPath(self):
         m3uPath = ''
@@ -1804,10 +2060,60 @@ class ConfigManager():
             bugManager.push(bugManager.configManager,'getM3uPath (Exception caught)', setNotification=True)
         return m3uPath
 
+    # Get m3u url from configuration, '' if the playlist is a local file
+    def getM3uUrl(self):
+        m3uUrl = ''
+        try:
+            if isM3uUrl(self.config['m3uFile']):
+                m3uUrl = str(self.config['m3uFile']).strip()
+        except:
+            m3uUrl = ''
+        return m3uUrl
+
+    # Get path of the local copy of an m3u url (see RemotePlaylist)
+    def getRemoteM3uPath(self, m3uUrl):
+        return os.path.join(self.remoteM3uPath, hashlib.sha1(m3uUrl.encode('utf-8')).hexdigest() + '.m3u')
+
+    # Get active m3u playlists from configuration in priority order: [file name or url, ...]
+    # Configurations without m3uFiles use m3uFile
+    def getM3uFiles(self):
+        m3uFiles = []
+        try:
+            if isinstance(self.config.get('m3uFiles'), list):
+                for m3uFile in self.config['m3uFiles']:
+                    m3uFile = str(m3uFile).strip()
+                    if len(m3uFile) > 0 and m3uFile not in m3uFiles:
+                        m3uFiles.append(m3uFile)
+            elif len(str(self.config['m3uFile']).strip()) > 0:
+                m3uFiles = [str(self.config['m3uFile']).strip()]
+        except:
+            m3uFiles = []
+        return m3uFiles
+
+    # Get active m3u playlists in priority order: [(url, path), ...], url = '' for files in m3u folder
+    # Missing files are skipped, no active playlist: Fallback to getM3uFilePath
+    def getM3uSources(self):
+        sources = []
+        try:
+            for m3uFile in self.getM3uFiles():
+                if isM3uUrl(m3uFile):
+                    sources.append((m3uFile, self.getRemoteM3uPath(m3uFile)))
+                elif os.path.isfile(os.path.join(self.m3uPath, m3uFile)):
+                    sources.append(('', os.path.join(self.m3uPath, m3uFile)))
+            if len(sources) == 0 and self.getM3uFilePath() != '':
+                sources.append((self.getM3uUrl(), self.getM3uFilePath()))
+        except:
+            sources = []
+            bugManager.push(bugManager.configManager,'getM3uSources (Exception caught)', setNotification=True)
+        return sources
+
     # Get m3u file path from configuration with fallback to first file in m3uFiles
+    # m3u url: Path of the local copy of the playlist (see RemotePlaylist), the file may not exist yet
     def getM3uFilePath(self):
         m3uFilePath = ''
         try:
+            if len(self.getM3uUrl()) > 0:
+                return self.getRemoteM3uPath(self.getM3uUrl())
             m3uFilePath = os.path.join(self.m3uPath,self.config['m3uFile'])
             if not os.path.isfile(m3uFilePath):
                 m3uFiles = []
@@ -1886,7 +2192,7 @@ class ConfigDialog(QtWidgets.QDialog):
         # Basic window settings
         bugManager.push(bugManager.configDialog,'setupGui: Window settings')
         self.setWindowFlags(QtCore.Qt.WindowType.Dialog | QtCore.Qt.WindowType.WindowTitleHint | QtCore.Qt.WindowType.CustomizeWindowHint)
-        self.resize(360*scalingFactor, 387*scalingFactor)
+        self.resize(360*scalingFactor, 467*scalingFactor)
         self.setModal(True)
         self.verticalLayout0 = QtWidgets.QVBoxLayout(self)
         bugManager.pop(bugManager.configDialog)
@@ -1967,15 +2273,26 @@ class ConfigDialog(QtWidgets.QDialog):
         bugManager.push(bugManager.configDialog,'setupGui: GroupBox gbVlcPlayList')
         self.gbVlcPlayList = QtWidgets.QGroupBox(self)
         self.verticalLayout5 = QtWidgets.QVBoxLayout(self.gbVlcPlayList)
-        self.cbVlcPlaylist = QtWidgets.QComboBox(self.gbVlcPlayList)
-        self.cbVlcPlaylist.setStyleSheet(f"QWidget {{ \
+        # Checked playlists are active, order = priority (drag & drop)
+        self.lwVlcPlaylists = QtWidgets.QListWidget(self.gbVlcPlayList)
+        self.lwVlcPlaylists.setStyleSheet(f"QWidget {{ \
+                                       background-color: rgb(255, 255, 255); \
+                                       selection-background-color: rgb(255, 255, 127); \
+                                       selection-color: rgb(0, 85, 255);}}")
+        self.lwVlcPlaylists.setFont(monoFont)
+        self.lwVlcPlaylists.setDragDropMode(QtWidgets.QAbstractItemView.DragDropMode.InternalMove)
+        self.lwVlcPlaylists.setDefaultDropAction(QtCore.Qt.DropAction.MoveAction)
+        self.lwVlcPlaylists.setMaximumHeight(QtGui.QFontMetrics(monoFont).height()*6)
+        self.verticalLayout5.addWidget(self.lwVlcPlaylists)
+        # Playlist url (http://, https://): Added to lwVlcPlaylists
+        self.leVlcPlaylistUrl = QtWidgets.QLineEdit(self.gbVlcPlayList)
+        self.leVlcPlaylistUrl.setStyleSheet(f"QWidget {{ \
                                        background-color: rgb(255, 255, 255); \
                                        selection-background-color: rgb(255, 255, 127); \
                                        selection-color: rgb(0, 85, 255);}}")
-        self.cbVlcPlaylist.setFont(monoFont)
-        self.cbVlcPlaylist.setMaxVisibleItems(5)
-        self.cbVlcPlaylist.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
-        self.verticalLayout5.addWidget(self.cbVlcPlaylist)
+        self.leVlcPlaylistUrl.setFont(monoFont)
+        self.leVlcPlaylistUrl.returnPressed.connect(self.addPlaylistUrl)
+        self.verticalLayout5.addWidget(self.leVlcPlaylistUrl)
         self.verticalLayout0.addWidget(self.gbVlcPlayList)
 
         self.vSpacer3 = QtWidgets.QSpacerItem(20, 0, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
@@ -2017,14 +2334,43 @@ class ConfigDialog(QtWidgets.QDialog):
                 if name.lower().endswith('.m3u') or name.lower().endswith('.m3u8'):
                   m3uFiles.append(name)
         m3uFiles = sorted(m3uFiles, key=str.lower)
-        selectedPos = 0
-        for index, m3uFile in enumerate(m3uFiles):
-            self.cbVlcPlaylist.addItem(m3uFile)
-            if self.configManager.getM3uFilePath().endswith(m3uFile):
-                selectedPos = index
-        self.cbVlcPlaylist.setCurrentIndex(selectedPos)
+        activeFiles = [m3uFile for m3uFile in self.configManager.getM3uFiles() if isM3uUrl(m3uFile) or m3uFile in m3uFiles]
+        if len(activeFiles) == 0 and len(self.configManager.getM3uUrl()) > 0:
+            activeFiles = [self.configManager.getM3uUrl()]
+        elif len(activeFiles) == 0 and self.configManager.getM3uFilePath() != '':
+            activeFiles = [os.path.basename(self.configManager.getM3uFilePath())]
+        for m3uFile in activeFiles:
+            self.addPlaylistItem(m3uFile, True)
+        for m3uFile in m3uFiles:
+            if m3uFile not in activeFiles:
+                self.addPlaylistItem(m3uFile, False)
         bugManager.pop(bugManager.configDialog)
 
+    # Add checkable playlist to lwVlcPlaylists
+    def addPlaylistItem(self, m3uFile, checked=False):
+        item = QtWidgets.QListWidgetItem(m3uFile)
+        item.setFlags(QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsUserCheckable | QtCore.Qt.ItemFlag.ItemIsDragEnabled)
+        item.setCheckState(QtCore.Qt.CheckState.Checked if checked else QtCore.Qt.CheckState.Unchecked)
+        self.lwVlcPlaylists.addItem(item)
+
+    # Add url of leVlcPlaylistUrl as active playlist with lowest priority
+    def addPlaylistUrl(self):
+        m3uUrl = self.leVlcPlaylistUrl.text().strip()
+        if isM3uUrl(m3uUrl):
+            if len(self.lwVlcPlaylists.findItems(m3uUrl, QtCore.Qt.MatchFlag.MatchExactly)) == 0:
+                self.addPlaylistItem(m3uUrl, True)
+            self.leVlcPlaylistUrl.clear()
+
+    # Get active playlists of lwVlcPlaylists in priority order
+    def getActivePlaylists(self):
+        self.addPlaylistUrl()
+        m3uFiles = []
+        for row in range(self.lwVlcPlaylists.count()):
+            item = self.lwVlcPlaylists.item(row)
+            if item.checkState() == QtCore.Qt.CheckState.Checked:
+                m3uFiles.append(item.text())
+        return m3uFiles
+
     # Initialize language settings in dialog form
     def setDialogLanguage(self, language='de'):
             if language == 'de':
@@ -2037,7 +2383,9 @@ class ConfigDialog(QtWidgets.QDialog):
                 self.lbServerUrl.setText(u"Server-URL:")
                 self.lbUserName.setText(u"Benutzername:")
                 self.lbPassword.setText(u"Passwort:")
-                self.gbVlcPlayList.setTitle(u"VLC-Wiedergabeliste")
+                self.gbVlcPlayList.setTitle(u"VLC-Wiedergabelisten")
+                self.lwVlcPlaylists.setToolTip(u"Aktive Wiedergabelisten ankreuzen\nReihenfolge (Drag & Drop) = Priorität bei doppelten Sendern")
+                self.leVlcPlaylistUrl.setPlaceholderText(u"Playlist-URL hinzufügen (http://..)")
                 self.pbCancel.setText(u" Abbruch ")
                 self.pbOK.setText(u" OK ")
             elif language == 'en':
@@ -2050,7 +2398,9 @@ class ConfigDialog(QtWidgets.QDialog):
                 self.lbServerUrl.setText(u"Server URL:")
                 self.lbUserName.setText(u"User Name:")
                 self.lbPassword.setText(u"Password:")
-                self.gbVlcPlayList.setTitle(u"VLC PlayList")
+                self.gbVlcPlayList.setTitle(u"VLC PlayLists")
+                self.lwVlcPlaylists.setToolTip(u"Check active playlists\nOrder (drag & drop) = priority of duplicate channels")
+                self.leVlcPlaylistUrl.setPlaceholderText(u"Add playlist url (http://..)")
                 self.pbCancel.setText(u" Cancel ")
                 self.pbOK.setText(u" OK ")
 
@@ -2089,7 +2439,8 @@ class ConfigDialog(QtWidgets.QDialog):
                 'username': self.leUserName.text(), 
                 'password': self.lePassword.text()
             }
-            config['m3uFile'] = self.cbVlcPlaylist.itemText(self.cbVlcPlaylist.currentIndex())
+            config['m3uFiles'] = self.getActivePlaylists()
+            config['m3uFile'] = config['m3uFiles'][0] if len(config['m3uFiles']) > 0 else self.configManager.config['m3uFile']
             config['soundProfile'] = self.configManager.getSoundProfile()
             bugManager.pop(bugManager.configDialog)
         except:
@@ -2103,10 +2454,8 @@ class ConfigDialog(QtWidgets.QDialog):
         usrPwOk = True
         self.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
         try:
-            base_url = url
-            api_url = f'{base_url}/api/channel/grid?limit=10000'
             usrPw = (user, password)
-            response = requests.get(api_url, auth=usrPw, timeout=2)
+            response = tvhClient.get(url, '/api/channel/grid', params={'limit': 10000}, auth=usrPw, timeout=2, retries=0)
             serverOk = True
             if response.status_code in [401, 403]: # 401=Unauthorized, 403=Forbidden
                 usrPwOk = False
@@ -2138,6 +2487,901 @@ class ConfigDialog(QtWidgets.QDialog):
     def cancelDialog(self):
         self.done(1)
 
+# class ChannelNameIndex
+# Trigram index of normalized channel names for type-to-filter (see normalizeChannelName)
+# postings[gram] = ascending list of rows. Queries up to 3 characters are answered by one posting list,
+# postings of 1 or 2 characters are built on first use. Longer queries scan the shortest posting list
+# of their trigrams. A query extending the previous query narrows the previous result only.
+class ChannelNameIndex():
+    def __init__(self):
+        self.names = []
+        self.postings = {}
+        self.lastQuery = ''
+        self.lastRows = None
+
+    # Build index of channel names
+    def build(self, names):
+        self.names = [normalizeChannelName(name) for name in names]
+        self.postings = {}
+        self.lastQuery = ''
+        self.lastRows = None
+        postings = self.postings
+        for row, name in enumerate(self.names):
+            for gram in {name[i:i+3] for i in range(len(name) - 2)}:
+                rows = postings.get(gram)
+                if rows == None:
+                    postings[gram] = [row]
+                else:
+                    rows.append(row)
+
+    # Get ascending list of rows matching query, None if query is empty
+    def search(self, query):
+        query = normalizeChannelName(query)
+        if len(query) == 0:
+            rows = None
+        elif len(query) < 3:
+            rows = self.postings.get(query)
+            if rows == None:
+                rows = [row for row, name in enumerate(self.names) if query in name]
+                self.postings[query] = rows
+        elif len(query) == 3:
+            rows = self.postings.get(query, [])
+        else:
+            candidates = min((self.postings.get(query[i:i+3], []) for i in range(len(query) - 2)), key=len)
+            if self.lastRows != None and len(self.lastQuery) > 0 and self.lastQuery in query and len(self.lastRows) < len(candidates):
+                candidates = self.lastRows
+            names = self.names
+            rows = [row for row in candidates if query in names[row]]
+        self.lastQuery = query
+        self.lastRows = rows
+        return rows
+
+# class ChannelTableModel
+# Model of the channel list: Column 0 = channel number, column 1 = channel name
+# Channel names are held in a compact list, numbers are derived from the row.
+# Data and tooltips are served on demand, so the view only requests the visible rows.
+# Tooltips are provided by toolTipProvider(row), e.g. EPG of the channel (see EpgManager.getToolTip)
+# Logos are provided by logoProvider(row) (see VideoManager.getChannelLogo)
+class ChannelTableModel(QtCore.QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.toolTipProvider = None
+        self.logoProvider = None
+        self.foregroundProvider = None
+        self.alignments = [
+            int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter),
+            int(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        ]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        row = index.row()
+        if not index.isValid() or row >= len(self.names):
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return ' ' + str(row+1) + ' '
+            return ' ' + self.names[row]
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignments[index.column()]
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            if self.toolTipProvider != None:
+                return self.toolTipProvider(row)
+            return self.names[row]
+        if role == QtCore.Qt.ItemDataRole.DecorationRole and index.column() == 1 and self.logoProvider != None:
+            return self.logoProvider(row)
+        if role == QtCore.Qt.ItemDataRole.ForegroundRole and self.foregroundProvider != None:
+            return self.foregroundProvider(row)
+        return None
+
+    # Get channel name of row
+    def getName(self, row):
+        return self.names[row]
+
+    # Replace all channels
+    def setChannels(self, names):
+        self.beginResetModel()
+        self.names = list(names)
+        self.endResetModel()
+
+    # Insert channels at row
+    def insertChannels(self, row, names):
+        if len(names) > 0:
+            self.beginInsertRows(QtCore.QModelIndex(), row, row + len(names) - 1)
+            self.names[row:row] = names
+            self.endInsertRows()
+
+    # Remove count channels at row
+    def removeChannels(self, row, count):
+        if count > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row + count - 1)
+            del self.names[row:row + count]
+            self.endRemoveRows()
+
+    # Change channel name of row
+    def setName(self, row, name):
+        self.names[row] = name
+        self.dataChanged.emit(self.index(row, 1), self.index(row, 1))
+
+# class ChannelFilterModel
+# Proxy of ChannelTableModel showing the rows of a filter (see ChannelNameIndex) or collapsible channel groups
+# Visible rows are held in entries: Source rows >= 0, group header rows as -(group index + 1), entries = None shows all rows.
+# Filtered rows are an ascending list of source rows. Groups are shown as header rows followed by the rows
+# of expanded groups only, so rows of collapsed groups are never materialized. A filter overrides the groups.
+# Rows are hidden by a model reset of the proxy, channelModel and its data are not touched.
+# Based on QAbstractTableModel: index(), parent() and hasChildren() stay in C++, so a reset
+# of the view costs no Python calls per row.
+class ChannelFilterModel(QtCore.QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = None
+        self.rows = None # Filtered source rows
+        self.groups = [] # [(group name, [source row, ...]), ...]
+        self.rowGroups = {} # { source row: index of first group of row }
+        self.expanded = set() # Names of expanded groups
+        self.entries = None
+        self.positions = None # { source row: proxy row } of group entries
+        self.headerFont = QtGui.QFont()
+        self.headerFont.setBold(True)
+        self.alignments = [
+            int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter),
+            int(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        ]
+
+    # Set source model: Structural changes of the source model show all rows
+    def setSourceModel(self, sourceModel):
+        self.beginResetModel()
+        self.source = sourceModel
+        self.rows = None
+        self.groups = []
+        self.rowGroups = {}
+        self.setEntries()
+        sourceModel.modelAboutToBeReset.connect(self.sourceAboutToChange)
+        sourceModel.modelReset.connect(self.clearRows)
+        sourceModel.rowsAboutToBeInserted.connect(self.sourceAboutToChange)
+        sourceModel.rowsInserted.connect(self.clearRows)
+        sourceModel.rowsAboutToBeRemoved.connect(self.sourceAboutToChange)
+        sourceModel.rowsRemoved.connect(self.clearRows)
+        sourceModel.dataChanged.connect(self.sourceDataChanged)
+        self.endResetModel()
+
+    # Get source model
+    def sourceModel(self):
+        return self.source
+
+    # Structural change of the source model started
+    def sourceAboutToChange(self, *args):
+        self.beginResetModel()
+
+    # Show all rows after a structural change of the source model, groups are set up again by setGroups
+    def clearRows(self, *args):
+        self.rows = None
+        self.groups = []
+        self.rowGroups = {}
+        self.setEntries()
+        self.endResetModel()
+
+    # Set up visible entries of filter or groups
+    def setEntries(self):
+        self.positions = None
+        if self.rows != None or len(self.groups) == 0:
+            self.entries = self.rows
+        else:
+            self.entries = []
+            for group, (name, rows) in enumerate(self.groups):
+                self.entries.append(-group - 1)
+                if name in self.expanded:
+                    self.entries.extend(rows)
+            self.positions = {}
+            for pos, row in enumerate(self.entries):
+                if row >= 0 and row not in self.positions:
+                    self.positions[row] = pos
+
+    # Show rows (ascending list of source rows), None = all rows or groups
+    def setRows(self, rows):
+        if rows == None and self.rows == None:
+            return
+        self.beginResetModel()
+        self.rows = rows
+        self.setEntries()
+        self.endResetModel()
+
+    # Set groups: [(group name, [source row, ...]), ...], [] = no groups
+    def setGroups(self, groups):
+        self.beginResetModel()
+        self.groups = groups
+        self.rowGroups = {}
+        for group, (name, rows) in enumerate(groups):
+            for row in rows:
+                self.rowGroups.setdefault(row, group)
+        self.setEntries()
+        self.endResetModel()
+
+    # Return True if rows are filtered
+    def isFiltered(self):
+        return self.rows != None
+
+    # Return True if channel groups are shown
+    def isGrouped(self):
+        return self.rows == None and len(self.groups) > 0
+
+    # Get group index of proxy row, -1 if row is no group header
+    def getGroup(self, proxyRow):
+        if self.entries != None and 0 <= proxyRow < len(self.entries) and self.entries[proxyRow] < 0:
+            return -self.entries[proxyRow] - 1
+        return -1
+
+    # Expand or collapse group
+    def setGroupExpanded(self, group, expanded):
+        name = self.groups[group][0]
+        if expanded != (name in self.expanded):
+            if expanded:
+                self.expanded.add(name)
+            else:
+                self.expanded.discard(name)
+            if self.isGrouped():
+                self.beginResetModel()
+                self.setEntries()
+                self.endResetModel()
+
+    # Expand group of source row, returns True if the group was collapsed
+    def expandGroupOf(self, sourceRow):
+        group = self.rowGroups.get(sourceRow, -1)
+        if self.isGrouped() and group >= 0 and self.groups[group][0] not in self.expanded:
+            self.setGroupExpanded(group, True)
+            return True
+        return False
+
+    # Forward changed data of visible rows
+    def sourceDataChanged(self, topLeft, bottomRight, roles=[]):
+        for row in range(topLeft.row(), bottomRight.row() + 1):
+            index = self.mapFromSource(self.source.index(row, topLeft.column()))
+            if index.isValid():
+                self.dataChanged.emit(index, self.index(index.row(), bottomRight.column()), roles)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or self.source == None:
+            return 0
+        return self.source.rowCount() if self.entries == None else len(self.entries)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or self.source == None:
+            return 0
+        return self.source.columnCount()
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        group = self.getGroup(index.row())
+        if group < 0:
+            return self.source.data(self.mapToSource(index), role)
+        # Group header row: Expand indicator and group name with channel count
+        name, rows = self.groups[group]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return ' ' + ('\u25be' if name in self.expanded else '\u25b8') + ' '
+            return ' ' + name + ' (' + str(len(rows)) + ')'
+        if role == QtCore.Qt.ItemDataRole.FontRole:
+            return self.headerFont
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignments[index.column()]
+        return None
+
+    # Map index of proxy to index of source model, invalid index for group header rows
+    def mapToSource(self, proxyIndex):
+        if not proxyIndex.isValid() or self.source == None:
+            return QtCore.QModelIndex()
+        row = proxyIndex.row()
+        if self.entries != None:
+            if row >= len(self.entries) or self.entries[row] < 0:
+                return QtCore.QModelIndex()
+            row = self.entries[row]
+        return self.source.index(row, proxyIndex.column())
+
+    # Map index of source model to index of proxy, invalid index if row is hidden
+    def mapFromSource(self, sourceIndex):
+        if not sourceIndex.isValid():
+            return QtCore.QModelIndex()
+        row = sourceIndex.row()
+        if self.positions != None:
+            row = self.positions.get(row, -1)
+            if row < 0:
+                return QtCore.QModelIndex()
+        elif self.entries != None:
+            pos = bisect_left(self.entries, row)
+            if pos >= len(self.entries) or self.entries[pos] != row:
+                return QtCore.QModelIndex()
+            row = pos
+        return self.index(row, sourceIndex.column())
+
+# class PlaylistCache
+# Parsed m3u playlists (header and channels of parseM3u) are cached in configPath/playlists as marshal data.
+# Cache files are identified by the playlist path and hold the fingerprint of the playlist: size and mtime.
+# Size and mtime unchanged: The cache is used, otherwise the playlist is parsed and written to the cache again.
+# The playlist is never hashed on read: Remote playlists with unchanged content keep their mtime (see RemotePlaylist).
+# Cache files are memory-mapped, so only the channel table is unmarshalled. The newest maxFiles cache files are kept.
+# File layout: magic (4 bytes), format version (4 bytes), length of fingerprint (8 bytes), fingerprint, channels
+class PlaylistCache():
+    magic = b'CTPL'
+    version = 1
+
+    def __init__(self, maxFiles=10):
+        self.cachePath = os.path.join(configPath, 'playlists')
+        self.maxFiles = maxFiles
+
+    # Get cache file of playlist
+    def getCacheFile(self, path):
+        return os.path.join(self.cachePath, hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest() + '.cache')
+
+    # Get sha1 of file content
+    def getContentHash(self, path, chunkSize=1048576):
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(partial(f.read, chunkSize), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    # Read cached playlist: Returns (header, channels) or None if there is no valid cache
+    def read(self, path):
+        cacheFile = self.getCacheFile(path)
+        if not os.path.isfile(cacheFile):
+            return None
+        stat = os.stat(path)
+        with open(cacheFile, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:4] != self.magic or int.from_bytes(mm[4:8], 'little') != self.version:
+                    return None
+                fingerprintLen = int.from_bytes(mm[8:16], 'little')
+                fingerprint = marshal.loads(mm[16:16 + fingerprintLen])
+                if fingerprint['path'] != os.path.abspath(path) or fingerprint['size'] != stat.st_size or fingerprint['mtime'] != stat.st_mtime_ns:
+                    return None
+                with memoryview(mm) as data:
+                    channels = marshal.loads(data[16 + fingerprintLen:])
+        return fingerprint['header'], channels
+
+    # Write playlist to cache, stat = os.stat of the playlist before it was parsed
+    # Runs in a background thread: Errors are reported via bugQueue
+    def write(self, path, stat, header, channels):
+        try:
+            os.makedirs(self.cachePath, exist_ok=True)
+            if os.stat(path).st_mtime_ns != stat.st_mtime_ns:
+                return # Playlist has changed while it was parsed
+            fingerprint = marshal.dumps({'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'header': header})
+            self.writeCacheFile(path, fingerprint, marshal.dumps(channels))
+            cacheFiles = sorted(glob.glob(os.path.join(self.cachePath, '*.cache')), key=os.path.getmtime)
+            for oldFile in cacheFiles[:max(0, len(cacheFiles) - self.maxFiles)]:
+                os.remove(oldFile)
+        except:
+            bugQueue.put([bugManager.videoManager, 'PlaylistCache.write: Exception caught', False, True])
+
+    # Write cache file atomically: Temporary file per thread, as writes of the same playlist may run at the same time
+    def writeCacheFile(self, path, fingerprint, channelData):
+        cacheFile = self.getCacheFile(path)
+        tmpFile = cacheFile + '.' + str(os.getpid()) + '-' + str(get_ident()) + '.tmp'
+        with open(tmpFile, 'wb') as f:
+            f.write(self.magic + self.version.to_bytes(4, 'little') + len(fingerprint).to_bytes(8, 'little'))
+            f.write(fingerprint)
+            f.write(channelData)
+        os.replace(tmpFile, cacheFile)
+
+# Signals of RemotePlaylist
+class PlaylistSignals(QtCore.QObject):
+    playlistDownloaded = QtCore.Signal(str, bool) # url, local copy has changed
+    playlistsParsed = QtCore.Signal(object) # (sources, playlistStats, [(header, channels), ...]) of changed local playlists
+    channelListUpdated = QtCore.Signal()
+
+# class RemotePlaylist
+# m3u playlist of an url: A local copy (see ConfigManager.getRemoteM3uPath) is used, so startup never waits for the network.
+# refresh() downloads the playlist in a background thread. Requests are conditional (ETag, Last-Modified of the
+# last download in <copy>.json), a new playlist is written to a temporary file and replaces the copy atomically.
+# A playlist with the same sha1 as the copy (also kept in <copy>.json) does not replace it and is reported unchanged.
+# playlistDownloaded(url, changed) is emitted when the download has finished.
+class RemotePlaylist():
+    def __init__(self, signals):
+        self.signals = signals
+        self.url = ''
+        self.copyPath = ''
+        self.running = False
+        self.timeout = 30
+
+    # Set url and path of local copy
+    def setUrl(self, url='', copyPath=''):
+        self.url = url
+        self.copyPath = copyPath
+
+    # Start download of playlist, returns False if a download is running
+    def refresh(self):
+        if self.running or len(self.url) == 0:
+            return False
+        self.running = True
+        Thread(target=self.download, args=(self.url, self.copyPath), name='remotePlaylist', daemon=True).start()
+        return True
+
+    # Thread: Download playlist if it has changed
+    def download(self, url, copyPath, chunkSize=1048576):
+        changed = False
+        try:
+            metaFile = copyPath + '.json'
+            meta = {}
+            if os.path.isfile(copyPath) and os.path.isfile(metaFile):
+                with open(metaFile, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            headers = {}
+            if meta.get('url') == url:
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('lastModified'):
+                    headers['If-Modified-Since'] = meta['lastModified']
+            response = None
+            try:
+                response = httpClient.fetch(url, timeout=self.timeout, retries=1, headers=headers, statsKey='m3u playlist', stream=True)
+            except requests.exceptions.RequestException:
+                response = None # Network not available: Local copy is used
+            if response != None and response.status_code == 200:
+                os.makedirs(os.path.dirname(copyPath), exist_ok=True)
+                tmpFile = copyPath + '.' + str(os.getpid()) + '.tmp'
+                sha1 = hashlib.sha1()
+                with open(tmpFile, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=chunkSize):
+                        f.write(chunk)
+                        sha1.update(chunk)
+                with open(tmpFile, 'rb') as f:
+                    sample = f.read(65536)
+                if b'#EXTM3U' in sample or b'#EXTINF' in sample or b'#\x00E\x00X\x00T' in sample:
+                    # Hosts without ETag / Last-Modified send the whole playlist: An identical copy is kept (mtime, playlist cache)
+                    contentHash = sha1.hexdigest()
+                    copyHash = None
+                    if os.path.isfile(copyPath) and os.path.getsize(copyPath) == os.path.getsize(tmpFile):
+                        copyHash = meta.get('sha1') if meta.get('url') == url else None
+                        if copyHash == None:
+                            copyHash = PlaylistCache().getContentHash(copyPath) # Copy of an older version without sha1
+                    if copyHash == contentHash:
+                        os.remove(tmpFile)
+                    else:
+                        os.replace(tmpFile, copyPath)
+                        changed = True
+                    with open(metaFile, 'w', encoding='utf-8') as f:
+                        json.dump({'url': url, 'etag': response.headers.get('ETag', ''), 'lastModified': response.headers.get('Last-Modified', ''), 'sha1': contentHash}, f)
+                else:
+                    os.remove(tmpFile)
+                    bugQueue.put([bugManager.videoManager, 'RemotePlaylist.download: No m3u playlist', False, True])
+            if response != None:
+                response.close()
+        except:
+            bugQueue.put([bugManager.videoManager, 'RemotePlaylist.download: Exception caught', False, True])
+        self.running = False
+        self.signals.playlistDownloaded.emit(url, changed)
+
+# Signals of StreamProber workers
+class ProbeSignals(QtCore.QObject):
+    urlProbed = QtCore.Signal(str, object) # url, result
+
+# class StreamProber
+# Stream urls of m3u playlists are checked by a worker pool with bounded concurrency: A GET of the first bytes
+# measures the time to first byte, HLS playlists (#EXTM3U) are followed to their first variant and segment.
+# Results { url: {'ok', 'ttfb' (ms), 'status', 'time'} } are kept in configPath/probe.json, urls are probed
+# again after maxAge, failed urls (timeouts, transient errors) already after maxFailedAge.
+# Urls without http(s) (rtsp, udp, ..) are not probed. listeners(url) are called in the GUI thread.
+class StreamProber():
+    def __init__(self, maxWorkers=8, maxAge=86400, maxFailedAge=600):
+        self.streamProberOk = False
+        try:
+            bugManager.push(bugManager.streamProber,'__init__')
+            self.probeFile = os.path.join(configPath, 'probe.json')
+            self.maxWorkers = maxWorkers
+            self.maxAge = maxAge
+            self.maxFailedAge = maxFailedAge
+            self.timeout = 5
+            self.sampleSize = 65536 # Bytes read of HLS playlists
+            self.maxHops = 2 # master playlist > media playlist > segment
+            self.results = self.readResults()
+            self.lock = Lock()
+            self.urls = deque() # Urls waiting for a worker
+            self.generation = 0 # Workers of an older generation stop (see probe)
+            self.listeners = []
+            self.probeSignals = ProbeSignals()
+            self.probeSignals.urlProbed.connect(self.applyResult, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.saveTimer = QtCore.QTimer()
+            self.saveTimer.setSingleShot(True)
+            self.saveTimer.setInterval(5000) # Results are saved at most every 5s
+            self.saveTimer.timeout.connect(self.saveResults)
+            self.saveFuture = None # Running or queued writeResults of saveTimer
+            self.probePool = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='probeWorker')
+            self.streamProberOk = True
+            bugManager.pop(bugManager.streamProber)
+        except:
+            bugManager.setError(bugManager.streamProber)
+
+    # Read results of probe.json, results older than 7 * maxAge are dropped
+    def readResults(self):
+        results = {}
+        try:
+            if os.path.isfile(self.probeFile):
+                with open(self.probeFile, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+                minTime = time.time() - 7*self.maxAge
+                results = {url: result for url, result in results.items() if result.get('time', 0) >= minTime}
+        except:
+            results = {}
+            bugManager.push(bugManager.streamProber,'readResults: Exception caught', setNotification=True)
+        return results
+
+    # Timer: Write results to probe.json in a worker
+    def saveResults(self):
+        if self.streamProberOk:
+            self.saveFuture = self.probePool.submit(self.writeResults, dict(self.results))
+
+    # Worker: Write results to probe.json
+    def writeResults(self, results):
+        try:
+            tmpFile = self.probeFile + '.' + str(os.getpid()) + '-' + str(get_ident()) + '.tmp'
+            with open(tmpFile, 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+            os.replace(tmpFile, self.probeFile)
+        except:
+            bugQueue.put([bugManager.probeWorker, 'writeResults: Exception caught', False, True])
+
+    # Get result of url: None if the url has not been probed
+    def getResult(self, url):
+        return self.results.get(url)
+
+    # Probe urls in the given order, a running probe is replaced
+    # Urls with a result younger than maxAge (failed urls: maxFailedAge) are skipped
+    def probe(self, urls):
+        if not self.streamProberOk:
+            return
+        urls = [url for url in dict.fromkeys(urls) if url.lower().startswith(('http://', 'https://')) and self.isExpired(self.results.get(url))]
+        with self.lock:
+            self.generation += 1
+            self.urls = deque(urls)
+            generation = self.generation
+        for i in range(min(self.maxWorkers, len(urls))):
+            self.probePool.submit(self.probeWorker, generation)
+
+    # Check if url of result has to be probed again
+    def isExpired(self, result):
+        if result == None:
+            return True
+        maxAge = self.maxAge if result.get('ok', False) else self.maxFailedAge
+        return result.get('time', 0) < time.time() - maxAge
+
+    # Worker: Probe urls until the queue is empty or a new probe has started
+    def probeWorker(self, generation):
+        while True:
+            with self.lock:
+                if generation != self.generation or len(self.urls) == 0:
+                    return
+                url = self.urls.popleft()
+            result = None
+            try:
+                result = self.probeUrl(url)
+            except:
+                result = None
+                bugQueue.put([bugManager.probeWorker, 'probeWorker: Exception caught', False, True])
+            if result != None:
+                self.probeSignals.urlProbed.emit(url, result)
+
+    # Worker: Probe url, HLS playlists are followed up to maxHops
+    def probeUrl(self, url):
+        result = {'ok': False, 'ttfb': None, 'status': 0, 'time': int(time.time())}
+        for hop in range(self.maxHops + 1):
+            startTime = time.perf_counter()
+            try:
+                response = httpClient.fetch(url, timeout=self.timeout, retries=0, headers={'Range': 'bytes=0-' + str(self.sampleSize - 1)}, statsKey='stream probe', stream=True)
+            except requests.exceptions.RequestException:
+                result['ok'] = False
+                return result
+            try:
+                chunks = response.iter_content(chunk_size=4096)
+                data = next(chunks, b'')
+                if hop == 0:
+                    result['ttfb'] = int((time.perf_counter() - startTime) * 1000)
+                    result['status'] = response.status_code
+                result['ok'] = response.status_code < 400 and len(data) > 0
+                if not result['ok'] or not data.lstrip(b'\xef\xbb\xbf \r\n').startswith(b'#EXTM3U'):
+                    return result
+                for chunk in chunks:
+                    data += chunk
+                    if len(data) >= self.sampleSize:
+                        break
+                url = self.getHlsUri(data, response.url)
+            except requests.exceptions.RequestException:
+                result['ok'] = False
+                return result
+            finally:
+                response.close()
+            if url == None:
+                return result
+        return result
+
+    # Get first uri (variant playlist or segment) of an HLS playlist, None if the playlist has no uri
+    def getHlsUri(self, data, baseUrl):
+        for line in data.decode('utf-8', errors='replace').splitlines():
+            line = line.strip()
+            if len(line) > 0 and not line.startswith('#'):
+                return urljoin(baseUrl, line)
+        return None
+
+    # GUI thread: Store result and notify listeners
+    def applyResult(self, url, result):
+        try:
+            bugManager.push(bugManager.streamProber,'applyResult')
+            bugManager.pushBugQueue()
+            self.results[url] = result
+            if not self.saveTimer.isActive():
+                self.saveTimer.start()
+            for listener in self.listeners:
+                listener(url)
+            bugManager.pop(bugManager.streamProber)
+        except:
+            bugManager.setError(bugManager.streamProber)
+
+    # Stop probing, save results and shut down worker pool
+    def shutdown(self):
+        if self.streamProberOk:
+            with self.lock:
+                self.generation += 1
+                self.urls = deque()
+            self.saveTimer.stop()
+            # A queued save is cancelled, a running save is finished before the final one
+            if self.saveFuture != None and not self.saveFuture.cancel():
+                try:
+                    self.saveFuture.result(timeout=5)
+                except:
+                    pass
+            self.writeResults(dict(self.results))
+            self.probePool.shutdown(wait=False, cancel_futures=True)
+
+# class HlsResolver
+# Zapping to an HLS master playlist costs VLC two round trips (master and media playlist) before the first segment.
+# Masters of likely next channels are prefetched by a small worker pool, the variant with the highest bandwidth
+# (not above maxBandwidth) is cached for ttl seconds. resolve() never waits: It returns the cached variant url or the
+# original url. Urls which are no master playlist are cached as they are, so they are not fetched again.
+# Masters with separate renditions (#EXT-X-MEDIA with URI, e.g. an audio group) are cached as they are, too:
+# Their variant playlists carry no audio, VLC has to open the master.
+# A variant url played directly is not switched adaptively by VLC, the short ttl keeps tokens of variant urls valid.
+class HlsResolver():
+    def __init__(self, maxWorkers=2, ttl=60, maxEntries=256, maxBandwidth=None):
+        self.hlsResolverOk = False
+        try:
+            bugManager.push(bugManager.videoManager,'HlsResolver.__init__')
+            self.ttl = ttl
+            self.maxEntries = maxEntries
+            self.maxBandwidth = maxBandwidth
+            self.timeout = 3
+            self.sampleSize = 262144 # Bytes read of master playlists
+            self.lock = Lock()
+            self.variants = OrderedDict() # LRU: { url: (expiry time, variant url) }
+            self.pending = set()
+            self.hlsPool = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='hlsWorker')
+            self.hlsResolverOk = True
+            bugManager.pop(bugManager.videoManager)
+        except:
+            bugManager.setError(bugManager.videoManager)
+
+    # Get variant url of a cached master playlist, otherwise url
+    def resolve(self, url):
+        with self.lock:
+            entry = self.variants.get(url)
+            if entry != None and entry[0] > time.monotonic():
+                self.variants.move_to_end(url)
+                return entry[1]
+        return url
+
+    # Prefetch master playlists of urls which are not cached
+    def prefetch(self, urls):
+        if not self.hlsResolverOk:
+            return
+        now = time.monotonic()
+        for url in urls:
+            if not url.lower().startswith(('http://', 'https://')) or '.m3u8' not in url.lower():
+                continue
+            with self.lock:
+                entry = self.variants.get(url)
+                if url in self.pending or (entry != None and entry[0] > now + self.ttl/2):
+                    continue
+                self.pending.add(url)
+            self.hlsPool.submit(self.loadMaster, url)
+
+    # Worker: Load master playlist and cache its variant
+    def loadMaster(self, url):
+        try:
+            variant = None
+            try:
+                response = httpClient.fetch(url, timeout=self.timeout, retries=0, statsKey='hls master', stream=True)
+                try:
+                    data = b''
+                    if response.status_code == 200:
+                        for chunk in response.iter_content(chunk_size=65536):
+                            data += chunk
+                            if len(data) >= self.sampleSize:
+                                break
+                    text = data.decode('utf-8', errors='replace')
+                    variants = parseHlsVariants(text, response.url)
+                    if len(variants) > 0 and not hasHlsRenditions(text):
+                        variant = self.chooseVariant(variants)
+                    elif response.status_code == 200:
+                        variant = url # Media playlist, master with renditions or no playlist: Nothing to resolve
+                finally:
+                    response.close()
+            except requests.exceptions.RequestException:
+                variant = None
+            with self.lock:
+                if variant != None:
+                    self.variants[url] = (time.monotonic() + self.ttl, variant)
+                    self.variants.move_to_end(url)
+                    if len(self.variants) > self.maxEntries:
+                        self.variants.popitem(last=False)
+        except:
+            bugQueue.put([bugManager.hlsWorker, 'loadMaster: Exception caught', False, True])
+        with self.lock:
+            self.pending.discard(url)
+
+    # Choose variant: Highest bandwidth not above maxBandwidth, lowest bandwidth if all are above
+    def chooseVariant(self, variants):
+        variants = sorted(variants)
+        if self.maxBandwidth != None:
+            allowed = [variant for variant in variants if variant[0] <= self.maxBandwidth]
+            return allowed[-1][1] if len(allowed) > 0 else variants[0][1]
+        return variants[-1][1]
+
+    # Drop cached variants
+    def clear(self):
+        with self.lock:
+            self.variants.clear()
+
+    # Shut down worker pool
+    def shutdown(self):
+        if self.hlsResolverOk:
+            self.hlsPool.shutdown(wait=False, cancel_futures=True)
+
+# Signals of LogoManager workers
+class LogoSignals(QtCore.QObject):
+    logoLoaded = QtCore.Signal(object, object) # (url, width, height), QImage or None
+
+# class LogoManager
+# Channel logos (m3u: tvg-logo, TVHeadend: icon_public_url) are loaded and decoded by a worker pool.
+# Original images of http urls are kept in a disk cache (configPath/logos, least recently used files are removed),
+# pixmaps scaled to the requested size are kept in a memory LRU.
+# getLogo returns None until the logo is loaded, then listeners(url) are called in the GUI thread.
+class LogoManager():
+    def __init__(self, maxWorkers=4, maxPixmaps=512, maxDiskFiles=2000):
+        self.logoManagerOk = False
+        try:
+            bugManager.push(bugManager.logoManager,'__init__')
+            self.logoPath = os.path.join(configPath, 'logos')
+            self.maxPixmaps = maxPixmaps
+            self.maxDiskFiles = maxDiskFiles
+            self.diskWrites = 0
+            self.pixmaps = OrderedDict() # LRU: { (url, width, height): QPixmap }
+            self.pending = set() # (url, width, height) of submitted tasks
+            self.failed = {} # { url: time of failed load }
+            self.retryInterval = 600 # Failed logos are loaded again after 10 minutes
+            self.authUrl = '' # Logos of TVHServer are loaded with username and password
+            self.auth = None
+            self.listeners = []
+            self.logoSignals = LogoSignals()
+            self.logoSignals.logoLoaded.connect(self.applyLogo, QtCore.Qt.ConnectionType.QueuedConnection)
+            os.makedirs(self.logoPath, exist_ok=True)
+            self.logoPool = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='logoWorker')
+            self.logoPool.submit(self.pruneDiskCache)
+            self.logoManagerOk = True
+            bugManager.pop(bugManager.logoManager)
+        except:
+            bugManager.setError(bugManager.logoManager)
+
+    # Set username and password for logos of TVHServer
+    def setAuth(self, serverUrl='', auth=None):
+        self.authUrl = serverUrl
+        self.auth = auth
+
+    # Username and password for url: Only urls on the TVHServer (same scheme, host and port) get them
+    def getAuth(self, url):
+        if len(self.authUrl) == 0:
+            return None
+        server = urlsplit(self.authUrl)
+        logo = urlsplit(url)
+        if logo.scheme.lower() != server.scheme.lower() or logo.netloc.lower() != server.netloc.lower():
+            return None
+        return self.auth
+
+    # Get logo scaled to size (QSize): Returns QPixmap or None if logo is not loaded yet
+    def getLogo(self, url, size):
+        key = (url, size.width(), size.height())
+        pixmap = self.pixmaps.get(key)
+        if pixmap != None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        if self.logoManagerOk and len(url) > 0 and key not in self.pending and time.time() - self.failed.get(url, 0) > self.retryInterval:
+            self.pending.add(key)
+            self.logoPool.submit(self.loadLogo, key, self.getAuth(url))
+        return None
+
+    # Worker: Load logo from disk cache, url or file and scale it to (width, height)
+    def loadLogo(self, key, auth):
+        url, width, height = key
+        image = None
+        try:
+            data = self.readLogo(url, auth)
+            if data != None:
+                image = QtGui.QImage.fromData(data)
+                if image.isNull():
+                    image = None
+                else:
+                    image = image.scaled(width, height, QtCore.Qt.AspectRatioMode.KeepAspectRatio, QtCore.Qt.TransformationMode.SmoothTransformation)
+        except:
+            image = None
+            bugQueue.put([bugManager.logoWorker, 'loadLogo: Exception caught', False, True])
+        self.logoSignals.logoLoaded.emit(key, image)
+
+    # Worker: Read original image of logo, None if logo can not be loaded
+    # Images of http urls are read from disk cache or loaded and written to disk cache
+    def readLogo(self, url, auth):
+        if not url.lower().startswith(('http://', 'https://')):
+            path = url[len('file://'):] if url.lower().startswith('file://') else url
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+            return None
+        cacheFile = os.path.join(self.logoPath, hashlib.sha1(url.encode('utf-8')).hexdigest())
+        if os.path.isfile(cacheFile):
+            os.utime(cacheFile)
+            with open(cacheFile, 'rb') as f:
+                return f.read()
+        try:
+            response = httpClient.fetch(url, auth=auth, timeout=5, statsKey='channel logo')
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200 or len(response.content) == 0:
+            return None
+        tmpFile = cacheFile + '.' + str(os.getpid()) + '.tmp'
+        with open(tmpFile, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmpFile, cacheFile)
+        self.diskWrites += 1
+        if self.diskWrites % 200 == 0:
+            self.pruneDiskCache()
+        return response.content
+
+    # Worker: Remove least recently used files if disk cache holds more than maxDiskFiles files
+    def pruneDiskCache(self):
+        try:
+            files = [os.path.join(self.logoPath, name) for name in os.listdir(self.logoPath)]
+            if len(files) > self.maxDiskFiles:
+                files.sort(key=os.path.getmtime)
+                for path in files[:len(files) - self.maxDiskFiles]:
+                    os.remove(path)
+        except:
+            bugQueue.put([bugManager.logoWorker, 'pruneDiskCache: Exception caught', False, True])
+
+    # GUI thread: Convert loaded logo to pixmap and notify listeners
+    def applyLogo(self, key, image):
+        try:
+            bugManager.push(bugManager.logoManager,'applyLogo')
+            bugManager.pushBugQueue()
+            self.pending.discard(key)
+            if image == None:
+                self.failed[key[0]] = time.time()
+            else:
+                self.failed.pop(key[0], None)
+                self.pixmaps[key] = QtGui.QPixmap.fromImage(image)
+                if len(self.pixmaps) > self.maxPixmaps:
+                    self.pixmaps.popitem(last=False)
+                for listener in self.listeners:
+                    listener(key[0])
+            bugManager.pop(bugManager.logoManager)
+        except:
+            bugManager.setError(bugManager.logoManager)
+
+    # Shut down worker pool
+    def shutdown(self):
+        if self.logoManagerOk:
+            self.logoPool.shutdown(wait=False, cancel_futures=True)
+
 # Class VideoManager
 class VideoManager(QtWidgets.QDialog):
     def __init__(self, parent=None, configManager=None, videoFrame=None, indicatorDic=None):
@@ -2153,6 +3397,7 @@ class VideoManager(QtWidgets.QDialog):
         self.vlcBusyImages = []
         self.lbPlayError = None
         self.lbMuted = None
+        self.lbChannelLogo = None
         self.playHistoryKey = 0
         self.playHistory = {}
         if self.indicatorDic != None:
@@ -2161,20 +3406,18 @@ class VideoManager(QtWidgets.QDialog):
             self.lbVlcBusy = indicatorDic['lbVlcBusy']
             self.vlcBusyImages = indicatorDic['busyImages']
             self.lbMuted = indicatorDic['lbMuted']
+            self.lbChannelLogo = indicatorDic['lbChannelLogo']
         self.videoFrame = videoFrame
         try:
             stackPos = bugManager.push(bugManager.videoManager,'__init__: Started')
 
             # Init VLC Player Worker        
             bugManager.push(bugManager.videoManager,'__init__: Setup VLC Worker')
-            while not statusQueue.empty():
-                r = statusQueue.get_nowait()
-            cmdQueue.put(['setupVlc',self.videoFrame.winId().__int__(), configManager.getVlcArgs(), bugManager.vlcWorker])
-            cmdQueue.put(['getInfo','vlcSetupOk'])
-            try:
-                self.vlcSetupOk = statusQueue.get(timeout=30)
-            except:
-                self.vlcSetupOk = False
+            self.mediaKey = 0 # Events of previous media are ignored (see applyPlayerEvent)
+            self.vlcEventBridge = VlcEventBridge()
+            self.vlcEventBridge.playerEvent.connect(self.applyPlayerEvent, QtCore.Qt.ConnectionType.QueuedConnection)
+            vlcClient.send('setupVlc', self.videoFrame.winId().__int__(), configManager.getVlcArgs(), bugManager.vlcWorker, self.vlcEventBridge)
+            self.vlcSetupOk = vlcClient.call('getInfo', 'vlcSetupOk', timeout=30, default=False)
             bugManager.pushBugQueue()
             bugManager.pop(bugManager.videoManager)
 
@@ -2186,10 +3429,25 @@ class VideoManager(QtWidgets.QDialog):
             self.verticalLayout = QtWidgets.QVBoxLayout(self)
             self.verticalLayout.setSpacing(3)
             self.verticalLayout.setContentsMargins(3, 3, 3, 3)
-            self.channelList = QtWidgets.QTableWidget(self)
+            # Channel filter: Typing narrows channelList (see applyChannelFilter)
+            self.leFilter = QtWidgets.QLineEdit(self)
+            self.leFilter.setClearButtonEnabled(True)
+            if self.configManager.getLanguage() == 'de':
+                self.leFilter.setPlaceholderText("Programm filtern")
+            else:
+                self.leFilter.setPlaceholderText("Filter channels")
+            self.verticalLayout.addWidget(self.leFilter)
+            # Channel list: Table view with fixed row heights, so only visible rows are laid out
+            # channelList shows channelModel through channelFilterModel: Filtered rows are hidden by the proxy
+            # QTableView instead of QTreeView: A reset of the proxy does not lay out all rows
+            self.channelModel = ChannelTableModel(self)
+            self.channelFilterModel = ChannelFilterModel(self)
+            self.channelFilterModel.setSourceModel(self.channelModel)
+            self.channelList = QtWidgets.QTableView(self)
+            self.channelList.setModel(self.channelFilterModel)
             self.channelList.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
             self.channelList.setAutoScroll(True)
-            self.channelList.setColumnCount(2)
+            self.channelList.setShowGrid(False)
             self.channelList.horizontalHeader().setVisible(False)
             self.channelList.verticalHeader().setVisible(False)
             self.channelList.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
@@ -2197,8 +3455,10 @@ class VideoManager(QtWidgets.QDialog):
             self.channelList.setSortingEnabled(False)
             self.channelList.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
             self.channelList.horizontalHeader().setMinimumSectionSize(0)
-            self.channelList.horizontalHeader().setSectionResizeMode(0,QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-            self.channelList.horizontalHeader().setSectionResizeMode(1,QtWidgets.QHeaderView.ResizeMode.Stretch)
+            self.channelList.horizontalHeader().setStretchLastSection(True)
+            self.channelList.horizontalHeader().setSectionResizeMode(0,QtWidgets.QHeaderView.ResizeMode.Fixed)
+            self.channelList.verticalHeader().setMinimumSectionSize(0)
+            self.channelList.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
             self.channelList.setWordWrap(False)
             self.verticalLayout.addWidget(self.channelList)
             self.maxChannelListWidth = 300 * scalingFactor
@@ -2206,12 +3466,75 @@ class VideoManager(QtWidgets.QDialog):
             bugManager.push(bugManager.videoManager,'__init__: Setup Objects')
             # Init TV-Channels
             self.tvChannels = []
+            self.channelFingerprint = None # (source, [(uuid, number, name), ...]) of channels shown in channelList
+            self.channelListChanged = True
+            self.maxChannelRowChanges = 50 # Up to 50 changed channels are applied to channelList in place
+            self.widestChannelName = ''
+            self.channelListFonts = OrderedDict() # LRU: { (widest channel name, number digits, maxChannelListWidth, dpi, hasLogos): (font, popup width) }
+            self.maxChannelListFonts = 16
+            self.channelNameIndex = ChannelNameIndex()
+            # Init channel logos: Logos are loaded when channelList or lbChannelLogo ask for them
+            self.logoManager = LogoManager()
+            self.logoManager.listeners.append(self.logoLoaded)
+            self.channelModel.logoProvider = self.getChannelLogo
+            self.logoUrls = [] # [logo url of row, ...]
+            self.logoRows = {} # { logo url: [row, ...] }
+            self.hasLogos = False
+            # Init stream prober: Dead m3u channels are shown grey
+            self.streamProber = StreamProber()
+            self.streamProber.listeners.append(self.urlProbed)
+            self.channelModel.foregroundProvider = self.getChannelForeground
+            self.probeRows = {} # { stream url: [row, ...] }
+            self.deadChannelBrush = QtGui.QBrush(QtGui.QColor(150, 150, 150))
+            self.reprobeTimer = QtCore.QTimer()
+            self.reprobeTimer.setInterval(self.streamProber.maxFailedAge * 1000) # Failed urls are probed again
+            self.reprobeTimer.timeout.connect(self.timerReprobe)
+            self.reprobeTimer.start()
+            # Init HLS resolver: Masters of the neighbours of the playing channel and of the selected channel are prefetched
+            self.hlsResolver = HlsResolver()
+            self.hlsPrefetchTimer = QtCore.QTimer()
+            self.hlsPrefetchTimer.setSingleShot(True)
+            self.hlsPrefetchTimer.setInterval(300) # Scrolling through channelList prefetches the row the selection stops at
+            self.hlsPrefetchTimer.timeout.connect(self.prefetchSelectedChannel)
+            self.logoSize = QtCore.QSize(32, 16)
+            self.blankLogo = QtGui.QPixmap()
+            self.channelLogoUrl = '' # Logo shown by lbChannelLogo
+            self.channelLogoTimer = QtCore.QTimer()
+            self.channelLogoTimer.setSingleShot(True)
+            self.channelLogoTimer.setInterval(5000) # Logo is shown for 5s after switching channel
+            self.channelLogoTimer.timeout.connect(self.hideChannelLogo)
+            self.tvgUrls = []
+            self.channelGroupOrder = {} # { name of TVHeadend channel tag: position in order of the tag index }
+            self.playlistCache = PlaylistCache()
+            # Init remote playlists {url: RemotePlaylist}: Refreshed when the channel list is set up and every hour
+            self.m3uSources = [] # Active playlists in priority order: [(url, path), ...]
+            self.playlistSignals = PlaylistSignals()
+            self.playlistSignals.playlistDownloaded.connect(self.applyPlaylistDownload, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.remotePlaylists = {}
+            self.playlistRefreshTimer = QtCore.QTimer()
+            self.playlistRefreshTimer.setInterval(3600*1000)
+            self.playlistRefreshTimer.timeout.connect(self.refreshRemotePlaylists)
+            # Init playlist watcher: Changes in m3u folder are collected for 1s, changed playlists are parsed in the background
+            self.playlistWatcher = QtCore.QFileSystemWatcher()
+            self.playlistWatcher.directoryChanged.connect(self.playlistFileChanged)
+            self.playlistWatcher.fileChanged.connect(self.playlistFileChanged)
+            self.playlistReloadTimer = QtCore.QTimer()
+            self.playlistReloadTimer.setSingleShot(True)
+            self.playlistReloadTimer.setInterval(1000)
+            self.playlistReloadTimer.timeout.connect(self.reloadPlaylists)
+            self.playlistSignals.playlistsParsed.connect(self.applyParsedPlaylists, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.playlistStats = {} # Local playlists of channel list: {path: (size, mtime)}
+            self.playlistReloading = False
+            self.playlistReloadPending = False # Remote playlist has changed while a reload was running
+            self.playingChannelKey = None # uuid or url of playing channel
             self.aktChannelName = ''
             # Init Message Label
             self.lbMessage = QtWidgets.QLabel(parent=self)
             self.setuplbMessage(bugManager.videoManager)
             # Init Status Timer and Vars
+            # Player state and sound are reported by player events, statusTimer animates lbVlcBusy and checks the sound timeout
             self.isPlaying = False
+            self.soundReady = False
             self.volume = 50
             self.volumeTimeout = 50 # 50 * 200ms = 10s
             self.volumeTimeoutCnt = 0
@@ -2225,10 +3548,15 @@ class VideoManager(QtWidgets.QDialog):
             bugManager.pop(bugManager.videoManager)
 
             bugManager.push(bugManager.videoManager,'__init__: Connect Signal-SLot')
-            self.channelList.itemActivated.connect(self.play) 
+            self.channelList.activated.connect(self.play) 
+            self.channelList.clicked.connect(self.toggleChannelGroup)  # Click on group header row
+            self.channelList.selectionModel().currentChanged.connect(self.channelSelected) # Prefetch HLS master
+            self.channelList.installEventFilter(self)                # Type-to-filter
+            self.leFilter.installEventFilter(self)
+            self.leFilter.textChanged.connect(self.applyChannelFilter)
+            self.leFilter.returnPressed.connect(self.playFilteredChannel)
             if platform.system() == "Darwin":
-                self.channelList.installEventFilter(self)            # Set Enter-Key to trigger play()
-                self.channelList.viewport().installEventFilter(self)
+                self.channelList.viewport().installEventFilter(self) # Set Enter-Key to trigger play()
             bugManager.pop(bugManager.videoManager)
 
             # Setup Video config
@@ -2238,19 +3566,37 @@ class VideoManager(QtWidgets.QDialog):
         except:
             bugManager.setError(bugManager.videoManager)
 
-    # Event filter: For MacOS only; Darwin blocks KeyPress events
+    # Event filter: Enter key for MacOS (Darwin blocks KeyPress events), group header keys and type-to-filter
     # Preconditions in __init__:
     #   self.channelList.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
     #   self.channelList.installEventFilter(self)
-    #   self.channelList.viewport().installEventFilter(self)
+    #   self.channelList.viewport().installEventFilter(self) (MacOS only)
+    #   self.leFilter.installEventFilter(self)
     def eventFilter(self, source, event):
-        # Catch Enter key
         if event.type() == QtCore.QEvent.Type.KeyPress:
-            if event.key() in (QtCore.Qt.Key.Key_Return, QtCore.Qt.Key.Key_Enter):
-                item = self.channelList.currentItem()
-                if item:
+            # Group header rows: Enter toggles, Right expands and Left collapses the group
+            if source == self.channelList and self.channelFilterModel.getGroup(self.channelList.currentIndex().row()) >= 0:
+                expanded = {QtCore.Qt.Key.Key_Return: None, QtCore.Qt.Key.Key_Enter: None, QtCore.Qt.Key.Key_Right: True, QtCore.Qt.Key.Key_Left: False}
+                if event.key() in expanded:
+                    self.toggleChannelGroup(self.channelList.currentIndex(), expanded[event.key()])
+                    return True
+            # Catch Enter key (MacOS)
+            if platform.system() == "Darwin" and source != self.leFilter and event.key() in (QtCore.Qt.Key.Key_Return, QtCore.Qt.Key.Key_Enter):
+                item = self.channelList.currentIndex()
+                if item.isValid():
                     self.play(item)
                     return True
+            # Printable keys of channelList are typed into leFilter
+            if source == self.channelList and event.text().strip() != '' and event.text().isprintable():
+                if not event.modifiers() & (QtCore.Qt.KeyboardModifier.ControlModifier | QtCore.Qt.KeyboardModifier.AltModifier | QtCore.Qt.KeyboardModifier.MetaModifier):
+                    self.leFilter.setFocus()
+                    self.leFilter.insert(event.text())
+                    return True
+            # Cursor keys of leFilter move to channelList
+            if source == self.leFilter and event.key() in (QtCore.Qt.Key.Key_Up, QtCore.Qt.Key.Key_Down, QtCore.Qt.Key.Key_PageUp, QtCore.Qt.Key.Key_PageDown):
+                self.channelList.setFocus()
+                QtWidgets.QApplication.sendEvent(self.channelList, event)
+                return True
         return super().eventFilter(source, event)
 
     # Play video on mouseDoubleClickEvent
@@ -2287,7 +3633,8 @@ class VideoManager(QtWidgets.QDialog):
         bugManager.pop(errorType)
 
     # Set up video configuration
-    def setupVideoConfig(self, errorType=1):
+    # playlists: Parsed local playlists of m3uSources (see reloadPlaylists), None = Read playlists
+    def setupVideoConfig(self, errorType=1, playlists=None):
         videoConfigOk = False
         stackPos1 = bugManager.push(errorType, 'setupVideoConfig')
         try:
@@ -2295,41 +3642,46 @@ class VideoManager(QtWidgets.QDialog):
             bugManager.push(errorType, 'setupVideoConfig: Init Vars')
             self.source = self.configManager.getSource()
             self.tvhServer = self.configManager.getTvhServer()
-            self.m3uFilePath = self.configManager.getM3uFilePath()
+            self.m3uSources = self.configManager.getM3uSources() if self.source == 'm3u' else []
+            self.setupRemotePlaylists()
+            self.setupPlaylistWatcher()
             bugManager.pop(errorType)
 
             # Read tvChannels
             stackPos2 = bugManager.push(errorType, 'setupVideoConfig: Read tvChannels')
+            self.tvgUrls = []
             if self.source == 'tvh':
                 self.tvChannels = self.fetchThvChannels(errorType=errorType)
             else:
-                self.tvChannels = self.fetchM3uChannels(errorType=errorType)
+                self.tvChannels = self.fetchM3uChannels(errorType=errorType, playlists=playlists)
             bugManager.pop(errorType, stackPos=stackPos2)
 
-            # Initialize QTableWidget channelList
-            bugManager.push(errorType, 'setupVideoConfig: Setup QTableWidget')
-            fm = QtGui.QFontMetrics(self.font())
-            while self.channelList.rowCount() > 0:
-                self.channelList.removeRow(0)
-            for channel in self.tvChannels:
-                row = self.channelList.rowCount()
-                self.channelList.insertRow(row)
-                chNumber = QtWidgets.QTableWidgetItem()
-                chNumber.setText(' ' + str(row+1) + ' ')
-                chNumber.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
-                self.channelList.setItem(row, 0, chNumber)
-                channelName = str(channel['name']).strip()
-                nameItem = QtWidgets.QTableWidgetItem(channelName)
-                nameItem.setText(' ' + channelName)
-                nameItem.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
-                self.channelList.setItem(row, 1, nameItem)
-            if self.channelList.rowCount() > 0:
-                self.channelList.selectRow(0)
-                try:
-                    self.channelList.verticalScrollBar().setValue(0)
-                    self.channelList.horizontalScrollBar().setValue(0)
-                except:
-                    pass
+            # Initialize channelModel
+            # Unchanged channels: channelModel is kept, few changes: Changed rows are updated in place
+            # The selected channel (or the playing channel) stays selected if it is still in the channel list
+            bugManager.push(errorType, 'setupVideoConfig: Setup channelModel')
+            fingerprint = self.getChannelFingerprint()
+            self.channelListChanged = fingerprint != self.channelFingerprint or self.channelModel.rowCount() != len(self.tvChannels)
+            selectedKey = self.getChannelKey(self.channelFingerprint, self.getSelectedRow())
+            if self.channelListChanged and not self.updateChannelRows(self.channelFingerprint, fingerprint):
+                self.channelModel.setChannels([self.getChannelName(channel) for channel in self.tvChannels])
+                if self.channelModel.rowCount() > 0:
+                    self.selectRow(0)
+                    try:
+                        self.channelList.verticalScrollBar().setValue(0)
+                        self.channelList.horizontalScrollBar().setValue(0)
+                    except:
+                        pass
+            if self.channelListChanged:
+                selectedRow = self.getChannelRow(fingerprint, [selectedKey, self.playingChannelKey])
+                self.widestChannelName = self.getWidestChannelName()
+                self.channelNameIndex.build(self.channelModel.names)
+                self.setupChannelGroups()
+                self.applyChannelFilter(self.leFilter.text(), selectedRow)
+                self.setupChannelLogos()
+                self.setupStreamProbe()
+            self.setNumberColumnWidth()
+            self.channelFingerprint = fingerprint
             bugManager.pop(errorType)
             
             bugManager.pop(errorType, stackPos=stackPos1)
@@ -2337,11 +3689,424 @@ class VideoManager(QtWidgets.QDialog):
         except:
             videoConfigOk = False
             self.tvChannels = []
-            while self.channelList.rowCount() > 0:
-                self.channelList.removeRow(0)
+            self.channelFingerprint = None
+            self.channelModel.setChannels([])
+            self.channelNameIndex.build([])
+            self.setupChannelLogos()
+            self.setupStreamProbe()
             bugManager.setError(errorType)
         return videoConfigOk
 
+    # Get key of channel in row of a fingerprint (uuid or url), None if the row is invalid
+    def getChannelKey(self, fingerprint, row):
+        if fingerprint == None or row < 0 or row >= len(fingerprint[1]):
+            return None
+        return fingerprint[1][row][0]
+
+    # Get row of the first channel key found in fingerprint, 0 if no key is found
+    def getChannelRow(self, fingerprint, keys):
+        keys = [key for key in keys if key != None]
+        if len(keys) > 0:
+            rows = {}
+            for row, channelKey in enumerate(fingerprint[1]):
+                rows.setdefault(channelKey[0], row)
+            for key in keys:
+                if key in rows:
+                    return rows[key]
+        return 0
+
+    # Set up downloads of remote playlists: A new url or a missing local copy start a download
+    def setupRemotePlaylists(self):
+        remotePlaylists = {}
+        for url, path in self.m3uSources:
+            if len(url) > 0:
+                remotePlaylist = self.remotePlaylists.get(url)
+                if remotePlaylist == None:
+                    remotePlaylist = RemotePlaylist(self.playlistSignals)
+                    remotePlaylist.setUrl(url, path)
+                    remotePlaylist.refresh()
+                elif not os.path.isfile(path):
+                    remotePlaylist.refresh()
+                remotePlaylists[url] = remotePlaylist
+        self.remotePlaylists = remotePlaylists
+        if len(self.remotePlaylists) > 0:
+            if not self.playlistRefreshTimer.isActive():
+                self.playlistRefreshTimer.start()
+        else:
+            self.playlistRefreshTimer.stop()
+
+    # Timer: Refresh all remote playlists
+    def refreshRemotePlaylists(self):
+        for remotePlaylist in self.remotePlaylists.values():
+            remotePlaylist.refresh()
+
+    # Watch m3u folder and local playlists of channel list (replaced files are detected by directoryChanged)
+    def setupPlaylistWatcher(self):
+        paths = []
+        if self.source == 'm3u':
+            paths = [path for url, path in self.m3uSources if len(url) == 0]
+            if os.path.isdir(self.configManager.m3uPath):
+                paths.append(self.configManager.m3uPath)
+        watched = self.playlistWatcher.files() + self.playlistWatcher.directories()
+        removed = [path for path in watched if path not in paths]
+        if len(removed) > 0:
+            self.playlistWatcher.removePaths(removed)
+        added = [path for path in paths if path not in watched and os.path.exists(path)]
+        if len(added) > 0:
+            self.playlistWatcher.addPaths(added)
+
+    # Get (size, mtime) of local playlists: {path: (size, mtime)}
+    def getPlaylistStats(self, sources):
+        return {path: self.getPlaylistStat(path) for url, path in sources if len(url) == 0}
+
+    # Get (size, mtime) of playlist, None if the file does not exist
+    def getPlaylistStat(self, path):
+        try:
+            stat = os.stat(path)
+            return (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+    # Playlist watcher: Changes are collected by playlistReloadTimer (files are often written in several steps)
+    def playlistFileChanged(self, path):
+        self.playlistReloadTimer.start()
+
+    # Timer: Parse changed local playlists in a background thread
+    def reloadPlaylists(self):
+        try:
+            bugManager.push(bugManager.videoManager,'reloadPlaylists')
+            if self.source == 'm3u':
+                self.setupPlaylistWatcher() # Replaced files are not watched anymore
+                if self.getPlaylistStats(self.m3uSources) != self.playlistStats:
+                    if self.playlistReloading:
+                        self.playlistReloadTimer.start() # Retry when running reload has finished
+                    else:
+                        self.startPlaylistParsing()
+            bugManager.pop(bugManager.videoManager)
+        except:
+            bugManager.setError(bugManager.videoManager)
+
+    # Start parsing playlists of m3uSources in a background thread (see applyParsedPlaylists)
+    def startPlaylistParsing(self):
+        self.playlistReloading = True
+        self.playlistReloadPending = False
+        Thread(target=self.parsePlaylists, args=(list(self.m3uSources),), name='playlistReload', daemon=True).start()
+
+    # Thread: Parse playlists of m3uSources, playlist cache is used for unchanged files
+    def parsePlaylists(self, sources):
+        playlists = None
+        stats = {}
+        try:
+            stats = self.getPlaylistStats(sources)
+            playlists = [self.readM3uFile(path, errorType=bugManager.videoManager) for url, path in sources]
+        except:
+            playlists = None
+            bugQueue.put([bugManager.videoManager, 'parsePlaylists: Exception caught', False, True])
+        self.playlistSignals.playlistsParsed.emit((sources, stats, playlists))
+
+    # GUI thread: Changed playlists have been parsed, only changed rows of the channel list are updated
+    # channelListUpdated is emitted if channels have changed (EPG reload)
+    def applyParsedPlaylists(self, result):
+        try:
+            bugManager.push(bugManager.videoManager,'applyParsedPlaylists')
+            bugManager.pushBugQueue()
+            self.playlistReloading = False
+            sources, stats, playlists = result
+            if playlists != None and self.source == 'm3u' and sources == self.m3uSources:
+                self.setupVideoConfig(errorType=bugManager.videoManager, playlists=playlists)
+                self.playlistStats = stats
+                if self.channelListChanged:
+                    self.playlistSignals.channelListUpdated.emit()
+            if self.playlistReloadPending and self.source == 'm3u':
+                self.startPlaylistParsing()
+            bugManager.pop(bugManager.videoManager)
+        except:
+            bugManager.setError(bugManager.videoManager)
+
+    # GUI thread: Download of remote playlist has finished
+    # Changed playlist: Playlists are parsed again in a background thread (see applyParsedPlaylists)
+    def applyPlaylistDownload(self, url, changed):
+        try:
+            bugManager.push(bugManager.videoManager,'applyPlaylistDownload')
+            bugManager.pushBugQueue()
+            if changed and self.source == 'm3u' and url in self.remotePlaylists:
+                if self.playlistReloading:
+                    self.playlistReloadPending = True # Parsed again when running reload has finished
+                else:
+                    self.startPlaylistParsing()
+            bugManager.pop(bugManager.videoManager)
+        except:
+            bugManager.setError(bugManager.videoManager)
+
+    # Get fingerprint of tvChannels: (source, [(uuid, number, name, logo url, groups), ...])
+    # m3u channels have no uuid and number: The url is used instead of the uuid
+    def getChannelFingerprint(self):
+        sourceKey = self.source + ':' + (self.tvhServer.get('url', '') if self.source == 'tvh' else '|'.join(path for url, path in self.m3uSources))
+        channelKeys = [(channel.get('uuid', channel.get('url', '')), channel.get('number', 0), str(channel['name']).strip(), self.getChannelLogoUrl(channel), tuple(channel.get('groups', []))) for channel in self.tvChannels]
+        return (sourceKey, channelKeys)
+
+    # Set up group index of channelList: [(group name, [row, ...]), ...]
+    # Channels without group are collected in a last group. Groups are shown if enabled and there are at least two groups.
+    def setupChannelGroups(self):
+        groupRows = {}
+        otherRows = []
+        for row, channel in enumerate(self.tvChannels):
+            groups = channel.get('groups', [])
+            for group in groups:
+                groupRows.setdefault(group, []).append(row)
+            if len(groups) == 0:
+                otherRows.append(row)
+        groups = list(groupRows.items())
+        if self.source == 'tvh' and len(self.channelGroupOrder) > 0:
+            groups.sort(key=lambda group: self.channelGroupOrder.get(group[0], len(self.channelGroupOrder)))
+        if len(otherRows) > 0 and len(groups) > 0:
+            groups.append(('Ohne Gruppe' if self.configManager.getLanguage() == 'de' else 'Other channels', otherRows))
+        if not self.configManager.getChannelGroups() or len(groups) < 2:
+            groups = []
+        self.channelFilterModel.setGroups(groups)
+
+    # Get logo url of channel: m3u = tvg-logo, TVHeadend = icon_public_url (relative to TVHServer url)
+    def getChannelLogoUrl(self, channel):
+        url = str(channel.get('tvg-logo', channel.get('icon_public_url', ''))).strip()
+        if len(url) > 0 and self.source == 'tvh' and not url.lower().startswith(('http://', 'https://')):
+            url = self.tvhServer.get('url', '').rstrip('/') + '/' + url.lstrip('/')
+        return url
+
+    # Set up logo urls of rows, logos are shown if enabled and at least one channel has a logo
+    def setupChannelLogos(self):
+        self.logoUrls = [self.getChannelLogoUrl(channel) for channel in self.tvChannels]
+        self.logoRows = {}
+        for row, url in enumerate(self.logoUrls):
+            if len(url) > 0:
+                self.logoRows.setdefault(url, []).append(row)
+        self.hasLogos = self.configManager.getChannelLogos() and len(self.logoRows) > 0
+        if self.source == 'tvh':
+            self.logoManager.setAuth(self.tvhServer.get('url', ''), (self.tvhServer.get('username', ''), self.tvhServer.get('password', '')))
+        else:
+            self.logoManager.setAuth()
+
+    # Get logo of row for channelList (see ChannelTableModel.logoProvider)
+    # Rows without loaded logo get a blank pixmap, so channel names stay aligned
+    def getChannelLogo(self, row):
+        if not self.hasLogos or row >= len(self.logoUrls):
+            return None
+        pixmap = self.logoManager.getLogo(self.logoUrls[row], self.logoSize) if len(self.logoUrls[row]) > 0 else None
+        return self.blankLogo if pixmap == None else pixmap
+
+    # Logo has been loaded: Update rows of the logo and lbChannelLogo
+    def logoLoaded(self, url):
+        for row in self.logoRows.get(url, []):
+            index = self.channelModel.index(row, 1)
+            self.channelModel.dataChanged.emit(index, index, [QtCore.Qt.ItemDataRole.DecorationRole])
+        if url == self.channelLogoUrl and self.channelLogoTimer.isActive():
+            self.showChannelLogo(url, restartTimer=False)
+
+    # Set up stream urls of rows and probe them: m3u channels only, TVHeadend channels are streamed by TVHServer
+    # The selected channel is probed first, the other channels in the order of channelList
+    def setupStreamProbe(self):
+        self.probeRows = {}
+        if self.source == 'm3u' and self.configManager.getStreamProbe():
+            for row, channel in enumerate(self.tvChannels):
+                self.probeRows.setdefault(channel.get('url', ''), []).append(row)
+            urls = list(self.probeRows.keys())
+            selectedRow = self.getSelectedRow()
+            if 0 <= selectedRow < len(self.tvChannels):
+                urls.insert(0, self.tvChannels[selectedRow].get('url', ''))
+            self.streamProber.probe(urls)
+        else:
+            self.streamProber.probe([])
+
+    # Timer: Probe expired urls again, i.e. failed urls after StreamProber.maxFailedAge
+    def timerReprobe(self):
+        try:
+            bugManager.push(bugManager.streamProber,'timerReprobe')
+            self.setupStreamProbe()
+            bugManager.pop(bugManager.streamProber)
+        except:
+            bugManager.setError(bugManager.streamProber)
+
+    # Get url for VLC: Variant of a prefetched HLS master playlist (m3u only), otherwise url
+    def resolveStreamUrl(self, url):
+        if self.source == 'm3u' and self.configManager.getHlsPrefetch():
+            return self.hlsResolver.resolve(url)
+        return url
+
+    # Prefetch HLS master playlists of rows (m3u only)
+    def prefetchChannels(self, rows):
+        if self.source == 'm3u' and self.configManager.getHlsPrefetch():
+            self.hlsResolver.prefetch([self.tvChannels[row].get('url', '') for row in rows if 0 <= row < len(self.tvChannels)])
+
+    # Selection of channelList has changed: Restart hlsPrefetchTimer
+    def channelSelected(self, current, previous):
+        self.hlsPrefetchTimer.start()
+
+    # Timer: Prefetch HLS master playlist of selected channel
+    def prefetchSelectedChannel(self):
+        if self.getSelectedRow() >= 0:
+            self.prefetchChannels([self.getSelectedRow()])
+
+    # Get text color of row for channelList (see ChannelTableModel.foregroundProvider): Grey if stream is dead
+    def getChannelForeground(self, row):
+        if len(self.probeRows) == 0 or row >= len(self.tvChannels):
+            return None
+        result = self.streamProber.getResult(self.tvChannels[row].get('url', ''))
+        if result != None and not result.get('ok', True):
+            return self.deadChannelBrush
+        return None
+
+    # Stream url has been probed: Update rows of the url
+    def urlProbed(self, url):
+        for row in self.probeRows.get(url, []):
+            self.channelModel.dataChanged.emit(self.channelModel.index(row, 0), self.channelModel.index(row, 1), [QtCore.Qt.ItemDataRole.ForegroundRole])
+
+    # Show logo of channel in lbChannelLogo for a few seconds, a logo which is not loaded yet is shown when it arrives
+    def showChannelLogo(self, url, restartTimer=True):
+        if self.lbChannelLogo != None:
+            self.channelLogoUrl = url
+            pixmap = None
+            if self.configManager.getChannelLogos() and len(url) > 0:
+                pixmap = self.logoManager.getLogo(url, self.lbChannelLogo.size())
+            if pixmap != None:
+                self.lbChannelLogo.setPixmap(pixmap)
+                self.lbChannelLogo.show()
+                self.lbChannelLogo.raise_()
+            else:
+                self.lbChannelLogo.hide()
+            if restartTimer:
+                self.channelLogoTimer.start()
+
+    # Timer: Hide lbChannelLogo
+    def hideChannelLogo(self):
+        self.channelLogoUrl = ''
+        if self.lbChannelLogo != None:
+            self.lbChannelLogo.hide()
+
+    # Get channel name shown in channelList
+    def getChannelName(self, channel):
+        return str(channel['name']).strip()
+
+    # Set width of number column, row height and logo size: Widest number is the number of the last row
+    def setNumberColumnWidth(self):
+        fontMetrics = QtGui.QFontMetrics(self.channelList.font())
+        width = fontMetrics.horizontalAdvance(' ' + str(max(1, self.channelModel.rowCount())) + ' ')
+        self.channelList.setColumnWidth(0, width + 2 * self.channelList.style().pixelMetric(QtWidgets.QStyle.PixelMetric.PM_FocusFrameHMargin) + 4)
+        self.channelList.verticalHeader().setDefaultSectionSize(fontMetrics.height() + 4)
+        self.channelFilterModel.headerFont = QtGui.QFont(self.channelList.font())
+        self.channelFilterModel.headerFont.setBold(True)
+        logoSize = QtCore.QSize(2 * fontMetrics.height(), fontMetrics.height())
+        if logoSize != self.logoSize or self.blankLogo.isNull():
+            self.logoSize = logoSize
+            self.blankLogo = QtGui.QPixmap(logoSize)
+            self.blankLogo.fill(QtCore.Qt.GlobalColor.transparent)
+        self.channelList.setIconSize(self.logoSize if self.hasLogos else QtCore.QSize(0, 0))
+
+    # Get widest channel name in application font
+    def getWidestChannelName(self):
+        fontMetrics = QtGui.QFontMetricsF(cyberTellyApp.font())
+        return max(self.channelModel.names, key=lambda name: fontMetrics.horizontalAdvance(' ' + name), default='')
+
+    # Fit font of channelList to widest channel name and return width of popup
+    # Fonts and widths are memoized in an LRU: Fitting only runs when channel names, channel count or dpi have changed
+    def setChannelListFont(self):
+        key = (self.widestChannelName, len(str(self.channelModel.rowCount())), self.maxChannelListWidth, self.logicalDpiX(), self.hasLogos)
+        if key not in self.channelListFonts:
+            font = fitSansSerifFont2PxWidth(' ' + self.widestChannelName, self.maxChannelListWidth)
+            self.setFont(font)
+            self.setNumberColumnWidth()
+            c0Width = self.channelList.columnWidth(0)
+            c1Width = QtGui.QFontMetrics(font).horizontalAdvance(' ' + self.widestChannelName) + 8
+            if self.hasLogos:
+                c1Width += self.logoSize.width() + 4
+            frWidth = self.channelList.frameWidth()
+            sbWidth = self.channelList.verticalScrollBar().sizeHint().width()
+            self.channelListFonts[key] = (font, c0Width+c1Width+sbWidth+frWidth*2+10)
+            if len(self.channelListFonts) > self.maxChannelListFonts:
+                self.channelListFonts.popitem(last=False)
+        self.channelListFonts.move_to_end(key)
+        font, width = self.channelListFonts[key]
+        if self.font() != font:
+            self.setFont(font)
+            self.setNumberColumnWidth()
+        return width
+
+    # Get selected row of channelModel, -1 if no row is selected
+    def getSelectedRow(self):
+        rows = self.channelList.selectionModel().selectedRows()
+        if len(rows) > 0:
+            return self.channelFilterModel.mapToSource(rows[0]).row()
+        return -1
+
+    # Select row of channelModel and make it current
+    # A row hidden by the filter clears the filter, a row of a collapsed group expands the group
+    def selectRow(self, row):
+        index = self.channelFilterModel.mapFromSource(self.channelModel.index(row, 0))
+        if not index.isValid() and self.channelFilterModel.isFiltered():
+            self.clearChannelFilter()
+            index = self.channelFilterModel.mapFromSource(self.channelModel.index(row, 0))
+        if not index.isValid() and self.channelFilterModel.expandGroupOf(row):
+            index = self.channelFilterModel.mapFromSource(self.channelModel.index(row, 0))
+        self.channelList.selectionModel().setCurrentIndex(index, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect | QtCore.QItemSelectionModel.SelectionFlag.Rows)
+        self.channelList.scrollTo(index)
+
+    # Filter channelList: Rows of channelNameIndex matching text are shown, empty text shows all rows or groups
+    # The selected row is kept if visible (its group is expanded), otherwise the first visible row is selected
+    def applyChannelFilter(self, text='', selectedRow=None):
+        if selectedRow == None:
+            selectedRow = self.getSelectedRow()
+        self.channelFilterModel.setRows(self.channelNameIndex.search(text))
+        if self.channelFilterModel.rowCount() > 0:
+            index = self.channelFilterModel.mapFromSource(self.channelModel.index(selectedRow, 0))
+            if not index.isValid() and self.channelFilterModel.expandGroupOf(selectedRow):
+                index = self.channelFilterModel.mapFromSource(self.channelModel.index(selectedRow, 0))
+            if not index.isValid():
+                index = self.channelFilterModel.index(0, 0)
+            self.channelList.selectionModel().setCurrentIndex(index, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect | QtCore.QItemSelectionModel.SelectionFlag.Rows)
+            self.channelList.scrollTo(index)
+
+    # Expand or collapse group of a group header row of channelList, the header row stays selected
+    def toggleChannelGroup(self, index, expanded=None):
+        group = self.channelFilterModel.getGroup(index.row())
+        if group >= 0:
+            if expanded == None:
+                expanded = self.channelFilterModel.groups[group][0] not in self.channelFilterModel.expanded
+            proxyRow = index.row()
+            self.channelFilterModel.setGroupExpanded(group, expanded)
+            index = self.channelFilterModel.index(proxyRow, 0)
+            self.channelList.selectionModel().setCurrentIndex(index, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect | QtCore.QItemSelectionModel.SelectionFlag.Rows)
+            self.channelList.scrollTo(index)
+        return group >= 0
+
+    # Clear filter of channelList
+    def clearChannelFilter(self):
+        if self.leFilter.text() != '':
+            self.leFilter.clear()
+        else:
+            self.applyChannelFilter()
+
+    # Play selected channel of filtered channelList (Enter key of leFilter)
+    def playFilteredChannel(self):
+        if self.getSelectedRow() >= 0:
+            self.play()
+
+    # Apply changes between two channel fingerprints to channelModel in place
+    # Returns False if channelModel has to be rebuilt: Source has changed or more than maxChannelRowChanges channels have changed
+    def updateChannelRows(self, oldFingerprint, newFingerprint):
+        if oldFingerprint == None or oldFingerprint[0] != newFingerprint[0] or self.channelModel.rowCount() != len(oldFingerprint[1]):
+            return False
+        matcher = SequenceMatcher(None, oldFingerprint[1], newFingerprint[1], autojunk=False)
+        opcodes = [opcode for opcode in matcher.get_opcodes() if opcode[0] != 'equal']
+        if sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in opcodes) > self.maxChannelRowChanges:
+            return False
+        # Rows i1..i2 are replaced by channels j1..j2, starting at the end keeps the row numbers of preceding changes valid
+        # Channel numbers are derived from the row by channelModel, so shifted rows need not be renumbered
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            common = min(i2 - i1, j2 - j1)
+            for k in range(common):
+                self.channelModel.setName(i1 + k, self.getChannelName(self.tvChannels[j1 + k]))
+            self.channelModel.removeChannels(i1 + common, i2 - i1 - common)
+            self.channelModel.insertChannels(i1 + common, [self.getChannelName(channel) for channel in self.tvChannels[j1 + common:j2]])
+        return True
+
     # Show message if channel ist is empty
     def showlbMessage(self, isVisible=True, errorType=1):
         if self.videoManagerOk:
@@ -2361,48 +4126,79 @@ class VideoManager(QtWidgets.QDialog):
                 bugManager.setError(errorType)
 
     # Fetch tv channels from THVServer
+    # Runs in the GUI thread: No retries, a server which is down must not block startup with retry delays
     def fetchThvChannels(self, errorType=1):
         channels = []
         try:
-            base_url = self.tvhServer['url']
-            api_url = f'{base_url}/api/channel/grid?limit=10000'
             usrPw = (self.tvhServer.get('username', ''), self.tvhServer.get('password', ''))
-            response = requests.get(api_url, auth=usrPw, timeout=2)
-            channels = sorted(response.json()['entries'], key=lambda channel: channel['number'])
+            channelGrid = tvhClient.getJson(self.tvhServer['url'], '/api/channel/grid', params={'limit': 10000}, auth=usrPw, timeout=2, retries=0, conditional=True)
+            channels = sorted(channelGrid['entries'], key=lambda channel: channel['number'])
         except:
             channels = []
             bugManager.push(errorType,'fetchTvhChannels: Exception caught', setNotification=True)
+        self.fetchTvhChannelTags(channels, errorType=errorType)
         return channels
+
+    # Fetch channel tags from THVServer and store names of the tags of each channel in channel['groups']
+    # Groups are ordered by the index of the tags, disabled and internal tags are skipped
+    def fetchTvhChannelTags(self, channels, errorType=1):
+        self.channelGroupOrder = {}
+        try:
+            if len(channels) > 0:
+                usrPw = (self.tvhServer.get('username', ''), self.tvhServer.get('password', ''))
+                tagGrid = tvhClient.getJson(self.tvhServer['url'], '/api/channeltag/grid', params={'limit': 1000}, auth=usrPw, timeout=2, retries=0, conditional=True)
+                tags = [tag for tag in tagGrid['entries'] if tag.get('enabled', True) and not tag.get('internal', False) and len(str(tag.get('name', '')).strip()) > 0]
+                tags.sort(key=lambda tag: (tag.get('index', 0), str(tag['name']).lower()))
+                tagNames = {tag['uuid']: str(tag['name']).strip() for tag in tags}
+                for name in tagNames.values():
+                    self.channelGroupOrder.setdefault(name, len(self.channelGroupOrder))
+                for channel in channels:
+                    channel['groups'] = sorted(set(tagNames[uuid] for uuid in channel.get('tags', []) if uuid in tagNames), key=self.channelGroupOrder.get)
+        except:
+            self.channelGroupOrder = {}
+            bugManager.push(errorType,'fetchTvhChannelTags: Exception caught', setNotification=True)
     
-    # Fetch tv channels from m3u playlist
-    def fetchM3uChannels(self, errorType=1):
+    # Fetch tv channels from m3u playlist (see parseM3u)
+    # Parsed playlists are read from playlistCache, a new cache file is written in the background
+    # XMLTV guide urls of the #EXTM3U header (url-tvg, x-tvg-url) are stored in self.tvgUrls
+    # Active playlists are merged in priority order, duplicate channels are dropped (see mergeM3uChannels)
+    # playlists: Parsed playlists of m3uSources [(header, channels), ...], None = Read playlists
+    def fetchM3uChannels(self, errorType=1, playlists=None):
         channels = []
+        self.tvgUrls = []
         try:
-            lines = []
-            for enc in ['utf-8', 'cp1252']: # cp1252 = ANSI
-                try:
-                    f = open(self.m3uFilePath,'r', encoding=enc)
-                    lines = f.readlines()
-                    f.close()
-                    break
-                except:
-                    lines = []
-            channel = {}
-            for line in lines:
-                line = line.strip()
-                if line.startswith("#EXTINF:"):
-                    channel = {}
-                    infos = str(line[len("#EXTINF:"):]).split(',')
-                    if len(infos) > 1:
-                        channel['name'] = infos[1].strip()
-                if len(channel) == 1 and not line.startswith("#"):
-                    channel["url"] = line
-                    channels.append(channel)
-                    channel = {}
+            if playlists == None:
+                self.playlistStats = self.getPlaylistStats(self.m3uSources)
+                playlists = [self.readM3uFile(path, errorType=errorType) for url, path in self.m3uSources]
+            for header, playlist in playlists:
+                for key in ['url-tvg', 'x-tvg-url']:
+                    if key in header:
+                        self.tvgUrls += [tvgUrl.strip() for tvgUrl in header[key].split(',') if len(tvgUrl.strip()) > 0 and tvgUrl.strip() not in self.tvgUrls]
+            channels = mergeM3uChannels([playlist for header, playlist in playlists])
         except:
             channels = []
             bugManager.push(errorType,'fetchM3uChannels: Exception caught', setNotification=True)
         return channels
+
+    # Read m3u file from playlist cache or parse it: (header, channels)
+    # Missing file (e.g. remote playlist not yet downloaded): ({}, [])
+    # Used by GUI thread and playlistReload thread: Errors are reported by bugQueue
+    def readM3uFile(self, m3uFilePath, errorType=1):
+        if not os.path.isfile(m3uFilePath):
+            return {}, []
+        cached = None
+        try:
+            cached = self.playlistCache.read(m3uFilePath)
+        except:
+            cached = None
+            bugQueue.put([errorType, 'readM3uFile: Exception reading playlist cache', False, True])
+        if cached != None:
+            return cached
+        stat = os.stat(m3uFilePath)
+        header = {}
+        channels = list(parseM3u(m3uFilePath, header))
+        Thread(target=self.playlistCache.write, args=(m3uFilePath, stat, header, channels), name='playlistCache', daemon=True).start()
+        return header, channels
     
     # Stop streaming channel
     def stop(self, errorType=1):
@@ -2415,16 +4211,13 @@ class VideoManager(QtWidgets.QDialog):
                     while self.statusTimer.isActive() and waitTime > 0:
                         time.sleep(0.5)
                         waitTime -= 1
-                    cmdQueue.put(['stop'])
-                    while not statusQueue.empty():
-                        statusQueue.get_nowait()
-                    cmdQueue.put(['getInfo','playerState'])
-                    try: 
-                        self.playerState = statusQueue.get(timeout=0.5)
-                    except:
-                        self.playerState = vlc.State.NothingSpecial
+                    vlcClient.send('stop')
+                    self.playerState = vlcClient.call('getInfo', 'playerState', timeout=0.5, default=vlc.State.NothingSpecial)
                 self.isPlaying = False
+                self.playingChannelKey = None
                 self.indicatorDic['pageLogoVisible'] = True
+                self.channelLogoTimer.stop()
+                self.hideChannelLogo()
                 if self.lbMuted.isVisible():
                     self.lbPageLogo.hide()
                 else:
@@ -2445,9 +4238,11 @@ class VideoManager(QtWidgets.QDialog):
                 errorType = bugManager.videoManager
             bugManager.push(errorType,'play')
             try:
-                if item == None and self.channelList.rowCount() > 0 and len(self.channelList.selectedItems()) > 0:
-                    item = self.channelList.selectedItems()[0]
-                if item != None:
+                if item == None and self.getSelectedRow() >= 0:
+                    item = self.channelModel.index(self.getSelectedRow(), 1)
+                elif item != None and item.model() == self.channelFilterModel:
+                    item = self.channelFilterModel.mapToSource(item)
+                if item != None and item.isValid():
                     # Wait for statusTimer
                     bugManager.push(errorType,'play: Wait for statusTimer')
                     self.statusTimer.stop()
@@ -2472,14 +4267,8 @@ class VideoManager(QtWidgets.QDialog):
                         self.lbPageLogo.hide()
                         self.lbPlayError.hide()
                         # Stop player
-                        cmdQueue.put(['stop'])
-                        while not statusQueue.empty():
-                            r = statusQueue.get_nowait()
-                        cmdQueue.put(['getInfo','playerState'])
-                        try:
-                            self.playerState = statusQueue.get(timeout=1.0)
-                        except:
-                            self.playerState = vlc.State.NothingSpecial
+                        vlcClient.send('stop')
+                        self.playerState = vlcClient.call('getInfo', 'playerState', timeout=1.0, default=vlc.State.NothingSpecial)
                         # Update videoFrame = wipe screen
                         self.videoFrame.update()
                         # Get volume
@@ -2488,12 +4277,16 @@ class VideoManager(QtWidgets.QDialog):
                             if self.soundManager.isMuted():
                                 self.volume = 0
                         # Start streaming
-                        while not statusQueue.empty():
-                            r = statusQueue.get_nowait()
                         self.addPlayHistoryEntry(source=self.source, channel=self.aktChannelName)
-                        cmdQueue.put(['setMedia',url])
-                        cmdQueue.put(['play', self.playHistoryKey-1])
-                        cmdQueue.put(['getInfo','getStateAndVolume'])
+                        self.playingChannelKey = self.getChannelKey(self.channelFingerprint, item.row())
+                        self.showChannelLogo(self.logoUrls[item.row()] if item.row() < len(self.logoUrls) else '')
+                        vlcOptions = self.tvChannels[item.row()].get('vlcopts', []) if self.source == 'm3u' else []
+                        self.mediaKey += 1
+                        self.soundReady = False
+                        vlcClient.send('setMedia', self.resolveStreamUrl(url), vlcOptions, self.mediaKey)
+                        vlcClient.send('play', self.playHistoryKey-1)
+                        vlcClient.flush()
+                        self.prefetchChannels([item.row() + 1, item.row() - 1, item.row() + 2])
                         # Set timer vars and objects and start statusTimer
                         self.volumeTimeoutCnt = 0
                         self.busyCnt = 0
@@ -2559,7 +4352,7 @@ class VideoManager(QtWidgets.QDialog):
                 bugManager.setError(errorType)
         return url, name
     
-    # Timer method to handle VLC status return codes
+    # Timer: Animate busy indicator while a channel is starting, finish zap if VLC sound is not ready after volumeTimeout
     def timerGetStatus(self):
         if self.videoManagerOk:
             try:
@@ -2571,60 +4364,12 @@ class VideoManager(QtWidgets.QDialog):
                         self.lbVlcBusy.raise_()
                     self.lbVlcBusy.setPixmap(self.vlcBusyImages[self.busyCnt % 4])
                     self.busyCnt += 1
- 
-                    bugManager.push(bugManager.statusTimer,'timerGetStatus - Get player status')
-                    # Get actual player status
-                    if not statusQueue.empty():
-                        playerState = self.playerState
-                        volume = -1
-                        try:
-                            self.playerState, volume = statusQueue.get_nowait()
-                        except:
-                            self.playerState = playerState
-                            volume = -1
-                        cmdQueue.put(['setVolume',self.volume])
-                        cmdQueue.put(['getInfo','getStateAndVolume'])
-                        self.isPlaying = self.playerState == vlc.State.Playing
-                        if self.isPlaying:
-                            cmdQueue.put(['setEqualizer', self.soundManager.soundProfile])
-                        bugManager.pop(bugManager.statusTimer)
-
-                        bugManager.push(bugManager.statusTimer,'timerGetStatus - Show Error Indicator')
-                        # Show error indicator in case of error or irregularly ended streaming
-                        if self.playerState in [vlc.State.Ended, vlc.State.Error]:
-                            if self.configManager.getLanguage() == 'de':
-                                self.lbPlayError.setToolTip('Streamingfehler: ' + self.aktChannelName)
-                            else:
-                                self.lbPlayError.setToolTip('Streaming error: ' + self.aktChannelName)
-                            self.lbPlayError.show()
-                            self.lbPlayError.raise_()
-                        bugManager.pop(bugManager.statusTimer)
-
-                        # Clean up in case of success
-                        bugManager.push(bugManager.statusTimer,'timerGetStatus - Clean up')
-                        if self.playerState in [vlc.State.Playing, vlc.State.Paused, vlc.State.Ended, vlc.State.Error, vlc.State.Stopped]:
-                            # Check if VLC sound is ready and skip cleaning up if it is not: Timeout 10s
-                            bugManager.push(bugManager.statusTimer,'timerGetStatus - Check if sound is ready')
-                            vlcSoundReady = False
-                            if self.playerState == vlc.State.Playing:
-                                vlcSoundReady = volume != -1
-                                self.volumeTimeoutCnt += 1
-                            else:
-                                vlcSoundReady = True
-                            bugManager.pop(bugManager.statusTimer)
-
-                            bugManager.push(bugManager.statusTimer,'timerGetStatus - Hide busy label an channel window')
-                            # Hide busy label and channel window if videostream is playing
-                            if vlcSoundReady or self.volumeTimeoutCnt >= self.volumeTimeout:
-                                while not statusQueue.empty():
-                                    p = statusQueue.get_nowait()
-                                self.lbVlcBusy.hide()
-                                self.statusTimer.stop()
-                                self.hide()
-                            bugManager.pop(bugManager.statusTimer)
-                        bugManager.pop(bugManager.statusTimer)
-                    else:
-                        cmdQueue.put(['getInfo','getStateAndVolume'])
+                    if self.isPlaying:
+                        self.volumeTimeoutCnt += 1
+                        if self.volumeTimeoutCnt >= self.volumeTimeout:
+                            self.finishZap()
+                        elif not self.soundReady:
+                            self.requestVolume()
                 else:
                     self.lbVlcBusy.hide()
                     self.statusTimer.stop()
@@ -2634,6 +4379,63 @@ class VideoManager(QtWidgets.QDialog):
         else:
             self.statusTimer.stop()
 
+    # GUI thread: Player event of VLC worker (see attachPlayerEvents), events of previous media are ignored
+    # Playing: Volume and equalizer are set, the zap is finished when VLC sound is ready (first volume event)
+    # Ended, Error: Error indicator is shown
+    def applyPlayerEvent(self, mediaKey, event, value):
+        if self.videoManagerOk and mediaKey == self.mediaKey:
+            try:
+                bugManager.push(bugManager.vlcEvents,'applyPlayerEvent: ' + event)
+                bugManager.pushBugQueue()
+                if event == 'state':
+                    self.playerState = value
+                    self.isPlaying = value == vlc.State.Playing
+                    if self.isPlaying:
+                        vlcClient.send('setVolume', self.volume)
+                        if self.soundManager != None and self.soundManager.soundManagerOk:
+                            vlcClient.send('setEqualizer', self.soundManager.soundProfile)
+                        if self.soundReady:
+                            self.finishZap()
+                        else:
+                            self.requestVolume()
+                    # Show error indicator in case of error or irregularly ended streaming
+                    if value in [vlc.State.Ended, vlc.State.Error]:
+                        if self.configManager.getLanguage() == 'de':
+                            self.lbPlayError.setToolTip('Streamingfehler: ' + self.aktChannelName)
+                        else:
+                            self.lbPlayError.setToolTip('Streaming error: ' + self.aktChannelName)
+                        self.lbPlayError.show()
+                        self.lbPlayError.raise_()
+                    if value in [vlc.State.Paused, vlc.State.Ended, vlc.State.Error, vlc.State.Stopped]:
+                        self.finishZap()
+                elif event == 'volume' and not self.soundReady:
+                    # Audio output is ready: Volume set before it existed is set again
+                    self.soundReady = True
+                    if self.isPlaying:
+                        vlcClient.send('setVolume', self.volume)
+                        self.finishZap()
+                bugManager.pop(bugManager.vlcEvents)
+            except:
+                bugManager.setError(bugManager.vlcEvents)
+
+    # Ask VLC worker for the volume: Not -1 if the audio output is ready, in case no volume event is sent by the aout module
+    # The result is forwarded as volume event of the current media (see applyPlayerEvent)
+    def requestVolume(self):
+        mediaKey = self.mediaKey
+        vlcClient.request('getInfo', 'getVolume').add_done_callback(lambda future: self.forwardVolume(mediaKey, future))
+
+    # Router thread: Forward result of requestVolume to the GUI thread
+    def forwardVolume(self, mediaKey, future):
+        if future.exception() == None and future.result() != None and future.result() != -1:
+            self.vlcEventBridge.playerEvent.emit(mediaKey, 'volume', future.result())
+
+    # Channel has started or failed: Hide busy label and channel window
+    def finishZap(self):
+        if self.statusTimer.isActive():
+            self.lbVlcBusy.hide()
+            self.statusTimer.stop()
+            self.hide()
+
 # Class SoundManager
 class SoundManager(QtWidgets.QDialog):
     def __init__(self, parent=None, indicatorDic=None, volume=50, soundProfile=sndStandard):
@@ -2830,7 +4632,7 @@ class SoundManager(QtWidgets.QDialog):
                 # VLC: set volume
                 bugManager.push(errorType,'setVolume: Set volume')
                 self.volume = volume
-                cmdQueue.put(['setVolume',volume])
+                vlcClient.send('setVolume', volume)
                 bugManager.pop(errorType)
 
                 bugManager.pop(errorType)
@@ -2876,7 +4678,7 @@ class SoundManager(QtWidgets.QDialog):
                 self.vslVolume.valueChanged.disconnect(self.setVolume)
                 self.vslVolume.setValue(volume)
                 self.vslVolume.valueChanged.connect(self.setVolume)
-                cmdQueue.put(['setVolume',volume])
+                vlcClient.send('setVolume', volume)
                 bugManager.pop(errorType)
 
                 bugManager.pop(errorType)
@@ -2888,7 +4690,7 @@ class SoundManager(QtWidgets.QDialog):
         if self.soundManagerOk:
             bugManager.push(errorType,'setEqualizer '+sndProfile)
             if sndProfile.lower() in soundProfiles:
-                cmdQueue.put(['setEqualizer', sndProfile.lower()])
+                vlcClient.send('setEqualizer', sndProfile.lower())
                 self.soundProfile = sndProfile.lower()
                 bugManager.pop(errorType)
             else:
@@ -2915,7 +4717,389 @@ class SoundManager(QtWidgets.QDialog):
         except: 
             bugManager.setError(bugManager.closeWindowTimer)
 
+# class HttpClient
+# Pooled requests.Session with retries and latency counters. The module-level httpClient loads everything which is not
+# part of the TVHeadend API from arbitrary hosts: Remote m3u playlists, XMLTV guides, channel logos, HLS masters and
+# stream probes. Connection pools of up to poolConnections hosts are kept, so the hosts of a playlist are reused.
+# Failed requests are retried with exponential backoff. Latency counters per statsKey are written to CyberTelly.log.
+class HttpClient():
+    def __init__(self, poolConnections=16, poolSize=8, retries=0, backoff=0.5):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=poolConnections, pool_maxsize=poolSize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        self.retries = retries
+        self.backoff = backoff # Delay before 1st retry, doubled for each further retry
+        self.stats = {} # { statsKey: {'requests', 'errors', 'retries', 'notModified', 'totalTime', 'maxTime'} }
+        self.lock = Lock()
+
+    # Send GET request, retry with backoff on connection errors, timeouts and server errors
+    # stream=True: Content is not downloaded until it is read from the response (e.g. large playlists)
+    # Returns response, raises exception if last try fails
+    def fetch(self, url, params=None, auth=None, timeout=2, retries=None, headers=None, statsKey='http', stream=False):
+        retries = self.retries if retries == None else retries
+        for attempt in range(retries + 1):
+            startTime = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, auth=auth, timeout=timeout, headers=headers, stream=stream)
+                self.addStats(statsKey, time.perf_counter() - startTime, attempt, response.status_code >= 500, response.status_code == 304)
+                if response.status_code < 500 or attempt == retries:
+                    return response
+                response.close() # Return connection of a stream response to the pool before retrying
+            except requests.exceptions.RequestException:
+                self.addStats(statsKey, time.perf_counter() - startTime, attempt, True, False)
+                if attempt == retries:
+                    raise
+            time.sleep(self.backoff * 2**attempt)
+
+    # Add request to latency counters of statsKey
+    def addStats(self, statsKey, duration, attempt, error, notModified):
+        with self.lock:
+            stats = self.stats.setdefault(statsKey, {'requests': 0, 'errors': 0, 'retries': 0, 'notModified': 0, 'totalTime': 0.0, 'maxTime': 0.0})
+            stats['requests'] += 1
+            stats['errors'] += 1 if error else 0
+            stats['retries'] += 1 if attempt > 0 else 0
+            stats['notModified'] += 1 if notModified else 0
+            stats['totalTime'] += duration
+            stats['maxTime'] = max(stats['maxTime'], duration)
+
+    # Get latency counters as lines for CyberTelly.log
+    def getStatsInfo(self):
+        lines = []
+        with self.lock:
+            for statsKey, stats in sorted(self.stats.items()):
+                lines.append(statsKey + ': requests=' + str(stats['requests']) + ', errors=' + str(stats['errors'])
+                             + ', retries=' + str(stats['retries']) + ', notModified=' + str(stats['notModified'])
+                             + ', avg=' + str(round(1000 * stats['totalTime'] / stats['requests'])) + 'ms'
+                             + ', max=' + str(round(1000 * stats['maxTime'])) + 'ms')
+        return lines
+
+# class TvhClient
+# Client for the TVHeadend API: All requests to TVHServer go through its own pooled session,
+# so connections to TVHServer are kept alive and reused by the GUI thread and the EPG workers.
+# Responses are gzip-compressed, JSON responses with ETag or Last-Modified are revalidated with conditional requests.
+# Latency counters are kept per endpoint. Requests to other hosts go through httpClient.
+class TvhClient(HttpClient):
+    def __init__(self, poolSize=8, retries=2, backoff=0.5):
+        super().__init__(poolConnections=2, poolSize=poolSize, retries=retries, backoff=backoff)
+        self.maxCacheEntries = 32
+        self.cache = {} # { request key: [etag, lastModified, json] }
+
+    # Send GET request to endpoint of TVHServer (see HttpClient.fetch)
+    # statsKey: Latency counters are added to statsKey instead of endpoint
+    def get(self, serverUrl, endpoint, params=None, auth=None, timeout=2, retries=None, headers=None, statsKey=None, stream=False):
+        return self.fetch(serverUrl + endpoint, params=params, auth=auth, timeout=timeout, retries=retries, headers=headers, statsKey=endpoint if statsKey == None else statsKey, stream=stream)
+
+    # Send GET request to TVHServer and return JSON of response
+    # conditional=True: Send If-None-Match/If-Modified-Since and reuse cached JSON if response is 304 Not Modified
+    # Raises exception if status code is not 200 or 304
+    def getJson(self, serverUrl, endpoint, params=None, auth=None, timeout=2, retries=None, conditional=False):
+        cacheKey = (serverUrl + endpoint, json.dumps(params, sort_keys=True), auth[0] if auth else '')
+        headers = {}
+        cached = None
+        if conditional:
+            with self.lock:
+                cached = self.cache.get(cacheKey)
+            if cached != None:
+                if cached[0]:
+                    headers['If-None-Match'] = cached[0]
+                if cached[1]:
+                    headers['If-Modified-Since'] = cached[1]
+        response = self.get(serverUrl, endpoint, params=params, auth=auth, timeout=timeout, retries=retries, headers=headers)
+        if response.status_code == 304 and cached != None:
+            return cached[2]
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(str(response.status_code) + ' ' + endpoint, response=response)
+        data = response.json()
+        if conditional:
+            etag = response.headers.get('ETag', '')
+            lastModified = response.headers.get('Last-Modified', '')
+            with self.lock:
+                self.cache.pop(cacheKey, None)
+                if etag or lastModified:
+                    if len(self.cache) >= self.maxCacheEntries:
+                        del self.cache[next(iter(self.cache))]
+                    self.cache[cacheKey] = [etag, lastModified, data]
+        return data
+
+# Signals of TvhCometListener
+class TvhCometSignals(QtCore.QObject):
+    cometNotification = QtCore.Signal(object)
+
+# class TvhCometListener
+# Background thread for push notifications of TVHServer: Long poll on /comet/poll
+# The first poll returns a boxid, following polls with this boxid are held by TVHServer until notifications arrive.
+# Messages of the notification classes 'channel' and 'epg' are emitted to the GUI thread.
+# Connection errors are retried with increasing delay, the thread ends when stop() is called.
+class TvhCometListener(Thread):
+    def __init__(self, tvhServer, signals):
+        super().__init__(name='tvhComet', daemon=True)
+        self.tvhServer = dict(tvhServer)
+        self.signals = signals
+        self.stopEvent = Event()
+        self.boxId = ''
+        self.pollTimeout = 30 # TVHServer holds a poll for up to 10s
+        self.maxRetryDelay = 60
+        self.notificationClasses = ['channel', 'epg']
+
+    # Long poll loop
+    def run(self):
+        usrPw = (self.tvhServer.get('username', ''), self.tvhServer.get('password', ''))
+        errors = 0
+        while not self.stopEvent.is_set():
+            try:
+                if self.boxId == '':
+                    params = {'immediate': 1}
+                else:
+                    params = {'boxid': self.boxId, 'immediate': 0}
+                cometResult = tvhClient.getJson(self.tvhServer['url'], '/comet/poll', params=params, auth=usrPw, timeout=self.pollTimeout, retries=0)
+                self.boxId = cometResult.get('boxid', self.boxId)
+                messages = [message for message in cometResult.get('messages', []) if message.get('notificationClass') in self.notificationClasses]
+                if len(messages) > 0 and not self.stopEvent.is_set():
+                    self.signals.cometNotification.emit(messages)
+                errors = 0
+            except:
+                errors += 1
+                self.boxId = ''
+                if errors == 1:
+                    bugQueue.put([bugManager.tvhNotifications, 'TvhCometListener: Exception caught', False, True])
+                self.stopEvent.wait(min(self.maxRetryDelay, 2**errors))
+
+    # Stop long poll loop
+    def stop(self):
+        self.stopEvent.set()
+
+# class EpgStore
+# Time-indexed EPG events: { uuid or tvg key: [event, ...] } sorted by start time.
+# A parallel list of start times per channel is searched with bisect, so now/next/at queries take O(log n)
+# and a multi-day guide can be held without rescanning the events.
+# Event lists are never modified in place: a snapshot of events can be saved by a worker thread.
+class EpgStore():
+    def __init__(self, events=None):
+        self.events = {} # { key: [event, ...] }
+        self.starts = {} # { key: [start, ...] }
+        self.eventKeys = {} # { eventId: key }
+        if events != None:
+            for key, keyEvents in events.items():
+                self.addEvents(key, keyEvents)
+
+    # Merge events into the events of a channel
+    # Events are deduplicated by eventId, events which have ended are dropped
+    def addEvents(self, key, events, now=None):
+        now = time.time() if now == None else now
+        merged = {}
+        for event in self.events.get(key, []) + list(events):
+            if event.get('stop', 0) > now:
+                merged[event.get('eventId', id(event))] = event
+        if len(merged) > 0:
+            self.removeEventKeys(key)
+            self.events[key] = sorted(merged.values(), key=lambda event: event.get('start', 0))
+            self.starts[key] = [event.get('start', 0) for event in self.events[key]]
+            for event in self.events[key]:
+                if 'eventId' in event:
+                    self.eventKeys[event['eventId']] = key
+        else:
+            self.remove(key)
+
+    # Remove all events of a channel
+    def remove(self, key):
+        self.removeEventKeys(key)
+        self.events.pop(key, None)
+        self.starts.pop(key, None)
+
+    # Remove event ids of a channel from eventKeys
+    def removeEventKeys(self, key):
+        for event in self.events.get(key, []):
+            if self.eventKeys.get(event.get('eventId')) == key:
+                del self.eventKeys[event['eventId']]
+
+    # Get keys of channels with the given event ids
+    def getEventKeys(self, eventIds):
+        return {self.eventKeys[eventId] for eventId in eventIds if eventId in self.eventKeys}
+
+    # Drop events which have ended, of all channels or of the given keys
+    # Returns keys of channels whose events have changed
+    def removeExpired(self, now=None, keys=None):
+        now = time.time() if now == None else now
+        changed = []
+        for key in list(self.events.keys() if keys == None else keys):
+            if key in self.events and self.events[key][0].get('stop', 0) <= now:
+                self.addEvents(key, [], now)
+                changed.append(key)
+        return changed
+
+    # Get events of a channel
+    def getEvents(self, key):
+        return self.events.get(key, [])
+
+    # Get event running at time t or None
+    def getEventAt(self, key, t):
+        index = bisect_right(self.starts.get(key, []), t) - 1
+        if index >= 0 and self.events[key][index].get('stop', 0) > t:
+            return self.events[key][index]
+        return None
+
+    # Get current event or None
+    def getNow(self, key, now=None):
+        return self.getEventAt(key, time.time() if now == None else now)
+
+    # Get first event starting after now or None
+    def getNext(self, key, now=None):
+        now = time.time() if now == None else now
+        starts = self.starts.get(key, [])
+        index = bisect_right(starts, now)
+        if index < len(starts):
+            return self.events[key][index]
+        return None
+
+    # Get events running between t0 and t1 (guide window)
+    def getRange(self, key, t0, t1):
+        starts = self.starts.get(key, [])
+        first = bisect_right(starts, t0) - 1
+        if first < 0 or self.events[key][first].get('stop', 0) <= t0:
+            first += 1
+        return self.events[key][first:bisect_left(starts, t1)] if key in self.events else []
+
+    # Get current event and following events, up to count events
+    def getUpcoming(self, key, count, now=None):
+        now = time.time() if now == None else now
+        starts = self.starts.get(key, [])
+        first = bisect_right(starts, now) - 1
+        if first < 0 or self.events[key][first].get('stop', 0) <= now:
+            first += 1
+        return self.events[key][first:first + count] if key in self.events else []
+
+    # Get stop time of last event of a channel (0 if there are no events)
+    def getCoverage(self, key):
+        events = self.events.get(key, [])
+        if len(events) > 0:
+            return events[-1].get('stop', 0)
+        return 0
+
+    # Get snapshot of events: { key: [event, ...] }
+    def snapshot(self):
+        return dict(self.events)
+
+# class EpgSearchIndex
+# Inverted index for full-text search of EPG events: { token: {(key, eventId), ...} }
+# The index is updated incrementally whenever events of a channel are merged into the EpgStore.
+# All tokens are kept in a sorted list as well: The last word of a query is matched as prefix (type-ahead).
+class EpgSearchIndex():
+    def __init__(self):
+        self.postings = {} # { token: {(key, eventId), ...} }
+        self.eventTokens = {} # { (key, eventId): tokens }
+        self.keyEvents = {} # { key: {eventId: event} }
+        self.sortedTokens = []
+        self.sortedTokensOk = True
+        self.minTokenLength = 2
+        self.maxResults = 200
+
+    # Get search tokens of title, subtitle and description of an event
+    # May run in a worker thread: Tokens are stored in the event, so they are only computed once
+    def getEventTokens(self, event):
+        tokens = event.get('searchTokens')
+        if tokens == None:
+            text = ' '.join([str(event.get(field) or '') for field in ['title', 'subtitle', 'summary', 'description']])
+            tokens = frozenset([token for token in epgSearchWords.findall(text.casefold()) if len(token) >= self.minTokenLength])
+            event['searchTokens'] = tokens
+        return tokens
+
+    # Update events of a channel: New and changed events are added, events which have been dropped are removed
+    def updateChannel(self, key, events):
+        oldEvents = self.keyEvents.get(key, {})
+        newEvents = {event.get('eventId', id(event)): event for event in events}
+        for eventId, event in oldEvents.items():
+            newEvent = newEvents.get(eventId)
+            if newEvent == None or self.getEventText(newEvent) != self.getEventText(event):
+                self.removeEvent(key, eventId)
+        for eventId, event in newEvents.items():
+            if (key, eventId) not in self.eventTokens:
+                self.addEvent(key, eventId, event)
+        if len(newEvents) > 0:
+            self.keyEvents[key] = newEvents
+        else:
+            self.keyEvents.pop(key, None)
+
+    # Get text fields of an event to detect changes
+    def getEventText(self, event):
+        return (event.get('title'), event.get('subtitle'), event.get('summary'), event.get('description'))
+
+    # Add event to postings
+    def addEvent(self, key, eventId, event):
+        docId = (key, eventId)
+        tokens = self.getEventTokens(event)
+        self.eventTokens[docId] = tokens
+        for token in tokens:
+            docIds = self.postings.get(token)
+            if docIds == None:
+                self.postings[token] = {docId}
+                self.sortedTokensOk = False
+            else:
+                docIds.add(docId)
+
+    # Remove event from postings
+    def removeEvent(self, key, eventId):
+        docId = (key, eventId)
+        for token in self.eventTokens.pop(docId, []):
+            docIds = self.postings.get(token)
+            if docIds != None:
+                docIds.discard(docId)
+                if len(docIds) == 0:
+                    del self.postings[token]
+
+    # Get (key, eventId) of all events with a token starting with prefix
+    def getPrefixPostings(self, prefix):
+        if not self.sortedTokensOk:
+            self.sortedTokens = sorted(self.postings.keys())
+            self.sortedTokensOk = True
+        docIds = set()
+        index = bisect_left(self.sortedTokens, prefix)
+        while index < len(self.sortedTokens) and self.sortedTokens[index].startswith(prefix):
+            docIds |= self.postings.get(self.sortedTokens[index], set())
+            index += 1
+        return docIds
+
+    # Search events containing all words of query, the last word may be incomplete
+    # Returns [(key, event), ...] of events which have not ended, sorted by start time
+    def search(self, query, now=None):
+        now = time.time() if now == None else now
+        words = epgSearchWords.findall(query.casefold())
+        if len(words) == 0 or len(words[-1]) < self.minTokenLength:
+            return []
+        docIds = None
+        for index, word in enumerate(words):
+            if index == len(words) - 1:
+                wordDocIds = self.getPrefixPostings(word)
+            elif len(word) >= self.minTokenLength:
+                wordDocIds = self.postings.get(word, set())
+            else:
+                continue
+            docIds = wordDocIds if docIds == None else docIds & wordDocIds
+            if len(docIds) == 0:
+                return []
+        results = []
+        for key, eventId in docIds:
+            event = self.keyEvents[key][eventId]
+            if event.get('stop', 0) > now:
+                results.append((key, event))
+        return heapq.nsmallest(self.maxResults, results, key=lambda result: result[1].get('start', 0))
+
+# Signals of EPG worker threads
+# Results of the worker pool are applied to the channel list in the GUI thread via queued connections
+class EpgSignals(QtCore.QObject):
+    epgResult = QtCore.Signal(object)
+
 # class EpgManger
+# EPG data is fetched and parsed by a worker pool with bounded concurrency.
+# The GUI thread never waits for TVHServer: Cached EPG data is shown immediately (stale-while-revalidate)
+# and tooltips are updated incrementally as soon as the results of the workers arrive.
+# EPG events are stored in epg.json next to config.json, so only expired channels are reloaded at startup.
+# For m3u playlists EPG is read from an XMLTV guide: <playlist>.xml(.gz) in the m3u folder or the url-tvg header.
+# Events are held in an EpgStore: Channels are only reloaded when their guide runs out (epgMinCoverage).
+# Updates are deadline-driven: A min-heap holds the end time of the current programme of each channel,
+# the single-shot updateEpgTimer wakes when the earliest programme ends and only these channels are refreshed.
+# TVHServer changes are pushed by a TvhCometListener: Only changed channels or channels of changed events are reloaded.
 class EpgManager():
     def __init__(self, configManager=None, videoManager=None):
         self.epgManagerOk = False
@@ -2925,22 +5109,82 @@ class EpgManager():
             bugManager.push(bugManager.epgManager,'__init__: Vars')
             self.configManager = configManager
             self.videoManager = videoManager
+            if self.videoManager != None and self.videoManager.videoManagerOk:
+                self.videoManager.channelModel.toolTipProvider = self.getToolTip
             bugManager.pop(bugManager.epgManager)
 
             # Set up EPG timer
             bugManager.push(bugManager.epgManager,'__init__: updateTime')
             self.updateEpgTimer = QtCore.QTimer()
-            self.epgUpdateBlocked = False
-            self.updateEpgInterval = 300000 # Interval for EPG updates = 300s
-            self.updateEpgTimer.setInterval(self.updateEpgInterval)
+            self.updateEpgTimer.setSingleShot(True)
+            self.updateEpgTimer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+            self.updateEpgInterval = 300000 # Channels without EPG are checked again after 300s
             self.updateEpgTimer.timeout.connect(self.timerUpdateEpg)
+            self.epgSchedule = [] # Min-heap: [(deadline, uuid or tvg key), ...]
+            self.epgDeadlines = {} # { uuid or tvg key: deadline }, outdated heap entries are skipped
+            self.epgScheduleEnabled = False
             bugManager.pop(bugManager.epgManager)
-            
+
+            # Settings for bulk EPG requests
+            self.epgEventsPerChannel = 4 # Number of events shown in tooltip
+            self.toolTipCache = OrderedDict() # LRU: { uuid or tvg key: (channel name, start of first event, tooltip) }
+            self.toolTipCacheSize = 64
+            self.epgPageSize = 1000 # Events per grid request
+            self.epgLookAhead = 12*3600 # Only events starting within the next 12h are requested
+            self.xmltvLookAhead = 3*24*3600 # Events of XMLTV guides starting within the next 3 days are kept
+            self.epgMinCoverage = 2*3600 # Channels whose guide ends within the next 2h are reloaded
+            self.epgChannelEventLimit = 50 # Events per channel request
+            self.epgBulkTimeout = 10
+            self.epgMinReloadInterval = 60 # Minimum interval between two reloads of expired EPG data = 60s
+            self.epgChannelRequestLimit = 20 # Up to 20 expired channels are loaded with one request per channel
+
+            # Set up worker pool
+            bugManager.push(bugManager.epgManager,'__init__: Worker pool')
+            self.epgMaxWorkers = 4
+            self.epgPool = ThreadPoolExecutor(max_workers=self.epgMaxWorkers, thread_name_prefix='epgWorker')
+            self.epgSignals = EpgSignals()
+            self.epgSignals.epgResult.connect(self.applyEpgResult, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.epgGeneration = 0 # Results of outdated channel lists are discarded
+            self.epgTasks = 0
+            self.epgLastLoad = 0.0
+            self.epgRows = {} # { uuid or tvg key: [row, ...] }
+            self.epgRowKeys = [] # [uuid or tvg key of row, ...]
+            self.epgSource = self.configManager.getSource()
+            self.xmltvReloadInterval = 3600 # XMLTV guides are reloaded at most once per hour
+            self.epgRequested = set()
+            self.epgChecked = {} # { uuid or tvg key: time of last load }
+            bugManager.pop(bugManager.epgManager)
+
+            # Set up push notifications of TVHServer
+            bugManager.push(bugManager.epgManager,'__init__: TVH notifications')
+            self.tvhCometSignals = TvhCometSignals()
+            self.tvhCometSignals.cometNotification.connect(self.applyTvhNotifications, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.tvhCometListener = None
+            self.tvhChannelsChanged = False
+            self.tvhChangedEvents = set()
+            self.tvhEventsCreated = False # Created events are not in epgStore: All channels are reloaded
+            self.epgReloadKeys = set() # Channels with changed events: Reloaded at their deadline even if their guide does not run out
+            self.tvhNotificationTimer = QtCore.QTimer()
+            self.tvhNotificationTimer.setSingleShot(True)
+            self.tvhNotificationTimer.setInterval(2000) # Notifications are collected for 2s
+            self.tvhNotificationTimer.timeout.connect(self.timerTvhNotifications)
+            if self.videoManager != None and self.videoManager.videoManagerOk:
+                self.videoManager.playlistSignals.channelListUpdated.connect(self.updateChannelList)
+            bugManager.pop(bugManager.epgManager)
+
+            # Read EPG cache
+            bugManager.push(bugManager.epgManager,'__init__: Read EPG cache')
+            self.epgCacheFile = os.path.join(self.configManager.configPath, 'epg.json')
+            self.epgCacheKeys = ['eventId', 'channelUuid', 'start', 'stop', 'title', 'subtitle', 'summary', 'description']
+            self.epgCacheLock = Lock()
+            self.epgSearchIndex = EpgSearchIndex()
+            self.setEpgStore(self.readEpgCache(errorType=bugManager.epgManager) if self.epgSource == 'tvh' else {})
+            bugManager.pop(bugManager.epgManager)
+
             self.epgManagerOk = True
 
             # Get EPG data
             bugManager.push(bugManager.epgManager,'__init__: Get epgData')
-            self.epgData = []
             self.fetchEpgData(errorType=bugManager.epgManager)
             bugManager.pop(bugManager.epgManager)
 
@@ -2949,132 +5193,587 @@ class EpgManager():
             bugManager.setError(bugManager.epgManager)
 
     # Fetch EPG Data
+    # Channel list has been (re)built: Show cached EPG data immediately and revalidate it in the background
     def fetchEpgData(self, errorType=1):
         if self.epgManagerOk and self.videoManager != None and self.videoManager.videoManagerOk:
             bugManager.push(errorType,'fetchEpgData')
             self.updateEpgTimer.stop()
+            self.epgGeneration += 1
+            self.epgTasks = 0
+            self.epgLastLoad = 0.0
             source = self.configManager.getSource()
-            epgData = []
+            if source != self.epgSource:
+                self.epgSource = source
+                self.epgChecked = {}
+                self.setEpgStore(self.readEpgCache(errorType=errorType) if source == 'tvh' else {})
+            self.epgSchedule = []
+            self.epgDeadlines = {}
+            self.epgReloadKeys = set()
             if source == 'tvh':
-                epgData = self.fetchEpgDataTvh(errorType=errorType)
-                if len(epgData) > 0: 
-                    self.updateEpgTimer.start(self.updateEpgInterval)
+                self.epgScheduleEnabled = True
+                self.fetchEpgDataTvh(errorType=errorType)
+                self.startEpgLoadTvh(self.getExpiredChannels(), errorType=errorType)
             elif source == 'm3u':
-                epgData = self.fetchEpgDataM3u(errorType=errorType)
-            self.epgData = epgData
+                self.epgScheduleEnabled = len(self.getXmltvSources()) > 0
+                self.fetchEpgDataM3u(errorType=errorType)
+                self.startEpgLoadXmltv(errorType=errorType)
+            self.startScheduleTimer()
+            self.updateTvhNotifications()
             bugManager.pop(errorType)
     
-    # Fetch EPG data from TVHServer
+    # Set up EPG rows for TVHServer channels and show cached events
+    # Rows without cached events get the channel name as tooltip and are marked as expired
     def fetchEpgDataTvh(self, errorType=1):
-        data = []
         try:
             bugManager.push(errorType,'fetchEpgDataTvh')
-            channelList = self.videoManager.channelList
-            tvhServer = self.configManager.getTvhServer()
-            usrPw = (tvhServer.get('username', ''), tvhServer.get('password', ''))
-            for row, tvChannel in enumerate(self.videoManager.tvChannels):
-                _, epgEntry = self.getEpgEntryTvh(tvhServer, usrPw, tvChannel, channelList.item(row,1), errorType=errorType)
-                data.append(epgEntry)
+            self.epgRows = {}
+            self.epgRowKeys = [tvChannel['uuid'] for tvChannel in self.videoManager.tvChannels]
+            for row, key in enumerate(self.epgRowKeys):
+                self.epgRows.setdefault(key, []).append(row)
+            self.refreshChannels(list(self.epgRows.keys()))
             bugManager.pop(errorType)
         except Exception as ex:
-            data = []
+            self.epgRows = {}
+            self.epgRowKeys = []
             bugManager.setError(errorType)
-        return data
 
-    # Fetch data from m3u playlist: Only returns channel name as tooltip
+    # Set up EPG rows for m3u playlists: Channel name as tooltip until XMLTV guide has been loaded
+    # Channels are indexed by tvg-id or normalized channel name, see getTvgKey
     def fetchEpgDataM3u(self, errorType=1):
-        data = []
         try:
             bugManager.push(errorType, 'fetchEpgDataM3u')
-            channelList = self.videoManager.channelList
-            for row, tvChannel in enumerate(self.videoManager.tvChannels):
-                epgEntry = []
-                epgEntry.append(channelList.item(row,1))
-                epgEntry.append(datetime.max)
-                toolTip = epgEntry[0].text().strip()
-                epgEntry[0].setToolTip(toolTip)
-                data.append(epgEntry)
+            self.epgRows = {}
+            self.epgRowKeys = [self.getTvgKey(tvChannel) for tvChannel in self.videoManager.tvChannels]
+            for row, key in enumerate(self.epgRowKeys):
+                self.epgRows.setdefault(key, []).append(row)
+            self.refreshChannels(list(self.epgRows.keys()))
             bugManager.pop(errorType)
         except:
-            data = []
+            self.epgRows = {}
+            self.epgRowKeys = []
             bugManager.setError(errorType)
-        return data
+
+    # Get key of m3u channel in XMLTV guide: tvg-id or normalized tvg-name or channel name
+    def getTvgKey(self, tvChannel):
+        if 'tvg-id' in tvChannel:
+            return tvChannel['tvg-id']
+        return normalizeChannelName(tvChannel.get('tvg-name', tvChannel.get('name', '')))
+
+    # Get path or urls of XMLTV guide
+    # Priority: <playlist>.xml or <playlist>.xml.gz in m3u folder, url-tvg header of playlists
+    def getXmltvSources(self):
+        sources = []
+        for m3uUrl, m3uFilePath in self.configManager.getM3uSources():
+            basePath, ext = os.path.splitext(m3uFilePath)
+            for xmltvFilePath in [basePath + '.xml', basePath + '.xml.gz']:
+                if os.path.isfile(xmltvFilePath):
+                    sources.append(xmltvFilePath)
+        if len(sources) == 0:
+            sources = list(self.videoManager.tvgUrls)
+        return sources
     
-    # Update EPG data (No update for m3u lists)
+    # Update EPG data of channels whose deadline has passed
+    # Tooltips of these channels are refreshed, channels whose guide runs out are reloaded in the background
     def updateEpgData(self, errorType=1):
-        if self.epgUpdateBlocked:
-            return
-        self.epgUpdateBlocked = True
         if self.epgManagerOk and self.videoManager != None and self.videoManager.videoManagerOk:
             bugManager.push(errorType,'updateEpgData')
-            if self.configManager.getSource() == 'tvh':
-                self.updateEpgDataTvh(errorType=errorType)
+            now = time.time()
+            dueKeys = []
+            while len(self.epgSchedule) > 0 and self.epgSchedule[0][0] <= now:
+                deadline, key = heapq.heappop(self.epgSchedule)
+                if self.epgDeadlines.get(key) == deadline:
+                    del self.epgDeadlines[key]
+                    dueKeys.append(key)
+            if len(dueKeys) > 0:
+                # Events which have ended are dropped from EPG store and search index
+                for key in self.epgStore.removeExpired(now, keys=dueKeys):
+                    self.epgSearchIndex.updateChannel(key, self.epgStore.getEvents(key))
+                self.refreshChannels(dueKeys)
+                expired = self.getExpiredChannels(dueKeys)
+                if len(expired) > 0:
+                    if self.configManager.getSource() == 'tvh':
+                        self.updateEpgDataTvh(expired, errorType=errorType)
+                    elif now - self.epgLastLoad >= self.xmltvReloadInterval:
+                        self.startEpgLoadXmltv(errorType=errorType)
+                    else:
+                        self.scheduleEpg(expired, self.epgLastLoad + self.xmltvReloadInterval)
+            self.startScheduleTimer()
             bugManager.pop(errorType)
-        self.epgUpdateBlocked = False
     
-    # Update EPG data from THVServer
-    def updateEpgDataTvh(self, errorType=1):
+    # Update EPG data of expired channels from THVServer
+    # Channels are scheduled again if a load is running or the last load was less than epgMinReloadInterval ago
+    def updateEpgDataTvh(self, uuids, errorType=1):
         bugManager.push(errorType,'updateEpgDataTvh')
-        tvhServer = self.configManager.getTvhServer()
-        usrPw = (tvhServer.get('username', ''), tvhServer.get('password', ''))
-        for row, tvChannel in enumerate(self.videoManager.tvChannels):
-            if self.epgData[row][1] < datetime.now():
-                entryOk, epgEntry = self.getEpgEntryTvh(tvhServer, usrPw, tvChannel, self.epgData[row][0], errorType=errorType)
-                if entryOk:
-                    self.epgData[row] = epgEntry
+        if time.time() - self.epgLastLoad < self.epgMinReloadInterval or not self.startEpgLoadTvh(uuids, errorType=errorType):
+            self.scheduleEpg(uuids, max(time.time(), self.epgLastLoad) + self.epgMinReloadInterval)
         bugManager.pop(errorType)
-    
-    def getEpgEntryTvh(self,tvhServer, usrPw, tvChannel, chListItem, errorType=1):
-        bugManager.push(errorType,'getEpgEntryTvh')
-        entryOk = False
-        epgEntry = []
-        epgEntry.append(chListItem)
-        epgEntry.append(datetime.now())
-        url = tvhServer['url'] + '/api/epg/events/grid'
-        response = requests.get(url, params={'limit': 4, 'channel': tvChannel['uuid']}, auth=usrPw, timeout=2)
-        if response.status_code == 200:
-            entryOk = True
-            toolTip = epgEntry[0].text().strip()
-            epgResult = response.json()['entries']
-            for index, entry in enumerate(epgResult):
-                epgLine = ''
-                if index == 0:
-                    try:
-                        epgEntry[1] = datetime.fromtimestamp(entry['stop'])
-                    except:
-                        epgEntry[1] = datetime.now()
+
+    # Schedule update of channels at deadline unless an earlier update is scheduled
+    def scheduleEpg(self, keys, deadline):
+        if self.epgScheduleEnabled:
+            for key in keys:
+                if key in self.epgRows and deadline < self.epgDeadlines.get(key, float('inf')):
+                    self.epgDeadlines[key] = deadline
+                    heapq.heappush(self.epgSchedule, (deadline, key))
+            # Drop outdated heap entries
+            if len(self.epgSchedule) > 2 * len(self.epgDeadlines) + 100:
+                self.epgSchedule = [(deadline, key) for key, deadline in self.epgDeadlines.items()]
+                heapq.heapify(self.epgSchedule)
+
+    # Start updateEpgTimer for the earliest deadline
+    def startScheduleTimer(self):
+        if self.epgScheduleEnabled and len(self.epgSchedule) > 0:
+            interval = min(max(0, self.epgSchedule[0][0] - time.time()), 86400)
+            self.updateEpgTimer.start(int(interval * 1000))
+        else:
+            self.updateEpgTimer.stop()
+
+    # Get keys of channels whose guide ends within epgMinCoverage or whose events have changed on TVHServer
+    # Channels are reloaded at most once per updateEpgInterval, so channels with a short guide are not polled
+    def getExpiredChannels(self, keys=None):
+        now = time.time()
+        expired = []
+        for key in (self.epgRows.keys() if keys == None else keys):
+            if key in self.epgReloadKeys or (self.epgStore.getCoverage(key) < now + self.epgMinCoverage and now - self.epgChecked.get(key, 0) >= self.updateEpgInterval / 1000):
+                expired.append(key)
+        return expired
+
+    # Start loading EPG data of the given channels from TVHServer in the background
+    # Few channels are requested one by one, otherwise all channels are loaded with paginated grid requests:
+    # The first grid page returns the total count of events, remaining pages are requested in applyEpgResult
+    # Returns False if a load is running
+    def startEpgLoadTvh(self, uuids, errorType=1):
+        bugManager.push(errorType,'startEpgLoadTvh')
+        started = False
+        if self.epgTasks == 0 and len(uuids) > 0:
+            started = True
+            self.epgLastLoad = time.time()
+            self.epgRequested = set(uuids)
+            self.epgReloadKeys.difference_update(uuids)
+            tvhServer = dict(self.configManager.getTvhServer())
+            usrPw = (tvhServer.get('username', ''), tvhServer.get('password', ''))
+            if len(uuids) <= self.epgChannelRequestLimit:
+                for uuid in uuids:
+                    self.submitEpgTask(self.loadEpgChannelTvh, self.epgGeneration, tvhServer, usrPw, uuid)
+            else:
+                self.submitEpgTask(self.loadEpgPageTvh, self.epgGeneration, tvhServer, usrPw, 0)
+        bugManager.pop(errorType)
+        return started
+
+    # Submit task to worker pool
+    def submitEpgTask(self, task, *args):
+        self.epgTasks += 1
+        try:
+            self.epgPool.submit(task, *args)
+        except:
+            self.epgTasks -= 1
+            raise
+
+    # Worker: Fetch one page of now/next events of all channels from TVHServer
+    # Events are grouped by channel uuid in one pass: { uuid: [event, ...] } sorted by start time
+    def loadEpgPageTvh(self, generation, tvhServer, usrPw, start):
+        result = {'generation': generation, 'task': 'page', 'start': start, 'events': {}, 'totalCount': 0, 'ok': False, 'tvhServer': tvhServer, 'usrPw': usrPw}
+        try:
+            now = int(time.time())
+            epgFilter = json.dumps([
+                {'field': 'stop', 'type': 'numeric', 'value': now, 'comparison': 'gt'},
+                {'field': 'start', 'type': 'numeric', 'value': now + self.epgLookAhead, 'comparison': 'lt'}
+            ])
+            params = {'start': start, 'limit': self.epgPageSize, 'sort': 'start', 'dir': 'ASC', 'filter': epgFilter}
+            epgResult = tvhClient.getJson(tvhServer['url'], '/api/epg/events/grid', params=params, auth=usrPw, timeout=self.epgBulkTimeout)
+            for entry in epgResult.get('entries', []):
+                self.epgSearchIndex.getEventTokens(entry)
+                result['events'].setdefault(entry.get('channelUuid', ''), []).append(entry)
+            result['totalCount'] = epgResult.get('totalCount', 0)
+            result['ok'] = True
+        except:
+            bugQueue.put([bugManager.epgWorker, 'loadEpgPageTvh: Exception caught, start=' + str(start), False, True])
+        self.epgSignals.epgResult.emit(result)
+
+    # Worker: Fetch EPG events of a single channel from TVHServer (fallback if bulk request fails)
+    def loadEpgChannelTvh(self, generation, tvhServer, usrPw, uuid):
+        result = {'generation': generation, 'task': 'channel', 'events': {}, 'ok': False}
+        try:
+            now = int(time.time())
+            epgFilter = json.dumps([
+                {'field': 'stop', 'type': 'numeric', 'value': now, 'comparison': 'gt'},
+                {'field': 'start', 'type': 'numeric', 'value': now + self.epgLookAhead, 'comparison': 'lt'}
+            ])
+            params = {'limit': self.epgChannelEventLimit, 'channel': uuid, 'sort': 'start', 'dir': 'ASC', 'filter': epgFilter}
+            result['events'][uuid] = tvhClient.getJson(tvhServer['url'], '/api/epg/events/grid', params=params, auth=usrPw, timeout=2)['entries']
+            for entry in result['events'][uuid]:
+                self.epgSearchIndex.getEventTokens(entry)
+            result['ok'] = True
+        except:
+            bugQueue.put([bugManager.epgWorker, 'loadEpgChannelTvh: Exception caught', False, True])
+        self.epgSignals.epgResult.emit(result)
+
+    # Start loading XMLTV guide of m3u playlist in the background
+    # Returns False if there is no guide for the playlist
+    def startEpgLoadXmltv(self, errorType=1):
+        bugManager.push(errorType,'startEpgLoadXmltv')
+        started = False
+        sources = self.getXmltvSources()
+        if self.epgTasks == 0 and len(sources) > 0 and len(self.epgRows) > 0:
+            self.epgLastLoad = time.time()
+            self.epgRequested = set(self.epgRows.keys())
+            self.submitEpgTask(self.loadEpgXmltv, self.epgGeneration, sources, set(self.epgRows.keys()))
+            started = True
+        bugManager.pop(errorType)
+        return started
+
+    # Worker: Read XMLTV guide from file or url with an incremental parser
+    # Only programmes of playlist channels (tvg keys) running within xmltvLookAhead are kept.
+    # Parsed elements are released immediately, so memory stays flat for large guides.
+    # Results are emitted in batches of xmltvBatchSize programmes.
+    def loadEpgXmltv(self, generation, sources, tvgKeys):
+        xmltvBatchSize = 5000
+        for source in sources:
+            result = {'generation': generation, 'task': 'xmltv', 'events': {}, 'ok': False}
+            stream = None
+            response = None
+            try:
+                if source.lower().startswith(('http://', 'https://')):
+                    response = httpClient.fetch(source, timeout=self.epgBulkTimeout, retries=1, statsKey='xmltv guide', stream=True)
+                    if response.status_code != 200:
+                        raise
+                    response.raw.decode_content = True
+                    stream = response.raw
+                    if source.lower().endswith('.gz') or 'gzip' in response.headers.get('Content-Type', ''):
+                        stream = gzip.GzipFile(fileobj=stream)
+                else:
+                    stream = open(source, 'rb')
+                    if stream.read(2) == b'\x1f\x8b':
+                        stream.seek(0)
+                        stream = gzip.GzipFile(fileobj=stream)
+                    else:
+                        stream.seek(0)
+                now = time.time()
+                channelKeys = {} # { xmltv channel id: tvg key }
+                batchSize = 0
+                root = None
+                for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                    if event == 'start':
+                        if root == None:
+                            root = elem
+                        continue
+                    if elem.tag == 'channel':
+                        channelId = elem.get('id', '')
+                        if channelId in tvgKeys:
+                            channelKeys[channelId] = channelId
+                        else:
+                            for displayName in elem.iter('display-name'):
+                                name = normalizeChannelName(displayName.text or '')
+                                if name in tvgKeys:
+                                    channelKeys[channelId] = name
+                                    break
+                        root.clear()
+                    elif elem.tag == 'programme':
+                        channelId = elem.get('channel', '')
+                        key = channelKeys.get(channelId, channelId if channelId in tvgKeys else None)
+                        if key != None:
+                            start = parseXmltvTime(elem.get('start', ''))
+                            stop = parseXmltvTime(elem.get('stop', ''))
+                            if stop > now and start < now + self.xmltvLookAhead:
+                                event = {
+                                    'eventId': key + '@' + str(start),
+                                    'channelUuid': key,
+                                    'start': start,
+                                    'stop': stop,
+                                    'title': elem.findtext('title', ''),
+                                    'subtitle': elem.findtext('sub-title', ''),
+                                    'description': elem.findtext('desc', '')
+                                }
+                                self.epgSearchIndex.getEventTokens(event)
+                                result['events'].setdefault(key, []).append(event)
+                                batchSize += 1
+                        root.clear()
+                        if batchSize >= xmltvBatchSize:
+                            result['ok'] = True
+                            self.epgSignals.epgResult.emit(dict(result, task='xmltvBatch'))
+                            result['events'] = {}
+                            batchSize = 0
+                result['ok'] = True
+            except:
+                bugQueue.put([bugManager.epgWorker, 'loadEpgXmltv: Exception caught', False, True])
+            finally:
                 try:
-                    epgLine = datetime.fromtimestamp(entry['start']).strftime('%H:%M') + ' ' + entry['title']
+                    if stream != None:
+                        stream.close()
+                    if response != None:
+                        response.close()
                 except:
-                    epgLine = ''
-                if len(epgLine) > 0:
-                    toolTip += '\n' + epgLine
-            epgEntry[0].setToolTip(toolTip)
-        bugManager.pop(errorType)
-        return entryOk, epgEntry
-    
+                    pass
+            if result['ok']:
+                break
+        self.epgSignals.epgResult.emit(result)
+
+    # GUI thread: Apply result of a worker task to EPG data and channel list tooltips
+    def applyEpgResult(self, result):
+        try:
+            bugManager.push(bugManager.epgManager,'applyEpgResult')
+            bugManager.pushBugQueue()
+            if result['generation'] == self.epgGeneration:
+                if result['task'] != 'xmltvBatch':
+                    self.epgTasks = max(0, self.epgTasks - 1)
+                for uuid, events in result['events'].items():
+                    self.mergeEpgEvents(uuid, events, replace=result['task'] == 'channel')
+                if result['task'] == 'page' and result['start'] == 0:
+                    if result['ok']:
+                        # Request remaining pages
+                        for start in range(self.epgPageSize, result['totalCount'], self.epgPageSize):
+                            self.submitEpgTask(self.loadEpgPageTvh, result['generation'], result['tvhServer'], result['usrPw'], start)
+                    else:
+                        # Fallback: One request per channel
+                        for uuid in self.epgRequested:
+                            self.submitEpgTask(self.loadEpgChannelTvh, result['generation'], result['tvhServer'], result['usrPw'], uuid)
+                if self.epgTasks == 0:
+                    self.finishEpgLoad()
+                self.startScheduleTimer()
+            bugManager.pop(bugManager.epgManager)
+        except:
+            bugManager.setError(bugManager.epgManager)
+
+    # GUI thread: All tasks of a load are done
+    # Remember time of load, schedule check of channels without EPG and save EPG cache of TVHServer in the background
+    def finishEpgLoad(self):
+        now = time.time()
+        for key in self.epgRequested:
+            self.epgChecked[key] = now
+        self.scheduleEpg([key for key in self.epgRequested if self.epgStore.getNow(key, now) == None], now + self.updateEpgInterval / 1000)
+        self.epgRequested = set()
+        if self.epgSource == 'tvh':
+            self.epgPool.submit(self.saveEpgCache, self.epgStore.snapshot(), self.configManager.getTvhServer()['url'])
+
+    # Merge loaded events of a channel into EPG store and search index and update its tooltips
+    # replace=True: Events of a channel request replace all events of the channel, so deleted events are dropped
+    def mergeEpgEvents(self, key, events, replace=False):
+        if replace:
+            self.epgStore.remove(key)
+        self.epgStore.addEvents(key, events)
+        self.epgSearchIndex.updateChannel(key, self.epgStore.getEvents(key))
+        self.refreshChannels([key])
+
+    # Set up EPG store and search index with events: { key: [event, ...] }
+    def setEpgStore(self, events):
+        self.epgStore = EpgStore(events)
+        self.toolTipCache.clear()
+        self.epgSearchIndex = EpgSearchIndex()
+        for key, keyEvents in self.epgStore.events.items():
+            self.epgSearchIndex.updateChannel(key, keyEvents)
+
+    # Search EPG events: Returns [(row, channel name, event), ...] of events of channels in channelList
+    def searchEpg(self, query):
+        results = []
+        if self.epgManagerOk:
+            for key, event in self.epgSearchIndex.search(query):
+                rows = self.epgRows.get(key, [])
+                if len(rows) > 0 and rows[0] < len(self.videoManager.tvChannels):
+                    results.append((rows[0], str(self.videoManager.tvChannels[rows[0]]['name']).strip(), event))
+        return results
+
+    # Schedule update of channels when their first event ends
+    # Cached tooltips of the channels are dropped and a visible tooltip of the channels is updated
+    def refreshChannels(self, keys):
+        now = time.time()
+        for key in keys:
+            self.toolTipCache.pop(key, None)
+            event = self.epgStore.getNow(key, now) or self.epgStore.getNext(key, now)
+            if event != None:
+                self.scheduleEpg([key], event.get('stop', 0))
+        self.refreshVisibleToolTip(keys)
+
+    # Get tooltip of a channelList row: Channel name followed by current and upcoming events
+    # Tooltips are built when the view asks for them. Recently built tooltips are kept in toolTipCache,
+    # a cached tooltip is valid until the first event of the channel changes (current programme has ended).
+    def getToolTip(self, row):
+        toolTip = ''
+        try:
+            toolTip = self.videoManager.channelModel.getName(row)
+            if row < len(self.epgRowKeys):
+                key = self.epgRowKeys[row]
+                events = self.epgStore.getUpcoming(key, self.epgEventsPerChannel)
+                stamp = events[0]['start'] if len(events) > 0 else 0
+                cached = self.toolTipCache.get(key)
+                if cached != None and cached[0] == toolTip and cached[1] == stamp:
+                    self.toolTipCache.move_to_end(key)
+                    return cached[2]
+                epgLines = []
+                for event in events:
+                    try:
+                        epgLines.append(datetime.fromtimestamp(event['start']).strftime('%H:%M') + ' ' + event['title'])
+                    except:
+                        pass
+                cached = (toolTip, stamp, '\n'.join([toolTip] + epgLines))
+                toolTip = cached[2]
+                self.toolTipCache[key] = cached
+                self.toolTipCache.move_to_end(key)
+                if len(self.toolTipCache) > self.toolTipCacheSize:
+                    self.toolTipCache.popitem(last=False)
+        except:
+            bugManager.push(bugManager.epgManager, 'getToolTip: Exception caught', setNotification=True)
+        return toolTip
+
+    # Update tooltip shown for a channelList row of one of the channels
+    def refreshVisibleToolTip(self, keys):
+        try:
+            if QtWidgets.QToolTip.isVisible() and self.videoManager.isVisible():
+                viewport = self.videoManager.channelList.viewport()
+                pos = QtGui.QCursor.pos()
+                index = self.videoManager.channelList.indexAt(viewport.mapFromGlobal(pos))
+                row = self.videoManager.channelFilterModel.mapToSource(index).row()
+                if 0 <= row < len(self.epgRowKeys) and self.epgRowKeys[row] in keys:
+                    QtWidgets.QToolTip.showText(pos, self.getToolTip(row), viewport)
+        except:
+            bugManager.push(bugManager.epgManager, 'refreshVisibleToolTip: Exception caught', setNotification=True)
+
     # Update EPG when videoManager channellist popup is about to be opened
+    # Returns immediately: Expired data is reloaded in the background
     def updateEpg(self, errorType=1):
         if self.epgManagerOk:
-            # Update EPG - see lock in updateEpgData
             try:
                 bugManager.push(errorType,'updateEpg') 
                 self.updateEpgData(errorType=errorType)
                 bugManager.pop(errorType)
             except:
-                self.epgUpdateBlocked = False
                 bugManager.setError(errorType)
     
-    # Timer to periodicylly update EPG data in the background
+    # Timer: Earliest deadline of EPG schedule has passed
     def timerUpdateEpg(self):
         try:
             bugManager.push(bugManager.updateEpgTimer,'timerUpdateEpg')
-            if not self.videoManager.isVisible():
-                self.updateEpgData(errorType=bugManager.updateEpgTimer)
+            self.updateEpgData(errorType=bugManager.updateEpgTimer)
             bugManager.pop(bugManager.updateEpgTimer)
         except:
-            self.epgUpdateBlocked = False
             bugManager.setError(bugManager.updateEpgTimer)
+
+    # Read EPG cache from epg.json: { uuid: [event, ...] }
+    # Events which have ended are dropped, cache of other TVHServers is ignored
+    def readEpgCache(self, errorType=1):
+        epgEvents = {}
+        try:
+            bugManager.push(errorType,'readEpgCache')
+            if os.path.isfile(self.epgCacheFile):
+                f = open(self.epgCacheFile, 'r', encoding='utf-8')
+                epgCache = json.load(f)
+                f.close()
+                if epgCache.get('server', '') == self.configManager.getTvhServer()['url']:
+                    now = time.time()
+                    for uuid, events in epgCache.get('channels', {}).items():
+                        events = [event for event in events if event.get('stop', 0) > now]
+                        if len(events) > 0:
+                            epgEvents[uuid] = events
+            bugManager.pop(errorType)
+        except:
+            epgEvents = {}
+            bugManager.push(errorType,'readEpgCache: Exception caught', setNotification=True)
+        return epgEvents
+
+    # Save EPG cache to epg.json
+    # May run in a worker thread: epgEvents is a snapshot, the file is replaced atomically
+    def saveEpgCache(self, epgEvents, serverUrl):
+        try:
+            channels = {}
+            for uuid, events in epgEvents.items():
+                channels[uuid] = [{key: event[key] for key in self.epgCacheKeys if key in event} for event in events]
+            epgCache = {'server': serverUrl, 'channels': channels}
+            with self.epgCacheLock:
+                tmpFile = self.epgCacheFile + '.tmp'
+                f = open(tmpFile, 'w', encoding='utf-8')
+                json.dump(epgCache, f)
+                f.close()
+                os.replace(tmpFile, self.epgCacheFile)
+        except:
+            bugQueue.put([bugManager.epgWorker, 'saveEpgCache: Exception caught', False, True])
+
+    # Start or stop listener for push notifications of TVHServer
+    # The listener is restarted if the TVHServer settings have changed
+    def updateTvhNotifications(self):
+        tvhServer = self.configManager.getTvhServer()
+        enabled = self.configManager.getSource() == 'tvh' and self.configManager.getTvhNotifications()
+        if self.tvhCometListener != None and (not enabled or self.tvhCometListener.tvhServer != tvhServer):
+            self.tvhCometListener.stop()
+            self.tvhCometListener = None
+        if enabled and self.tvhCometListener == None:
+            self.tvhCometListener = TvhCometListener(tvhServer, self.tvhCometSignals)
+            self.tvhCometListener.start()
+
+    # GUI thread: Collect notifications of TVHServer, they are applied by tvhNotificationTimer
+    # 'channel': Channel list has changed, 'epg': Events have been created, updated or deleted (event ids)
+    def applyTvhNotifications(self, messages):
+        try:
+            bugManager.push(bugManager.tvhNotifications,'applyTvhNotifications')
+            bugManager.pushBugQueue()
+            if self.tvhCometListener != None:
+                for message in messages:
+                    if message.get('notificationClass') == 'channel':
+                        self.tvhChannelsChanged = True
+                    elif message.get('notificationClass') == 'epg':
+                        for field in ['change', 'update', 'delete']:
+                            self.tvhChangedEvents.update(message.get(field, []))
+                        if len(message.get('create', [])) > 0:
+                            self.tvhEventsCreated = True
+                if (self.tvhChannelsChanged or self.tvhEventsCreated or len(self.tvhChangedEvents) > 0) and not self.tvhNotificationTimer.isActive():
+                    self.tvhNotificationTimer.start()
+            bugManager.pop(bugManager.tvhNotifications)
+        except:
+            bugManager.setError(bugManager.tvhNotifications)
+
+    # Timer: Apply collected notifications of TVHServer
+    # Changed channel list: Channel list and EPG are set up again, unless the channels are unchanged
+    # Changed events: Channels of these events are reloaded
+    # Created events: All channels are reloaded, the channels of new event ids are not known before they are loaded
+    # Reloads are throttled by updateEpgDataTvh: Within epgMinReloadInterval they are merged into the next scheduled load
+    def timerTvhNotifications(self):
+        try:
+            bugManager.push(bugManager.tvhNotifications,'timerTvhNotifications')
+            if self.tvhChannelsChanged:
+                self.tvhChannelsChanged = False
+                self.videoManager.setupVideoConfig(errorType=bugManager.tvhNotifications)
+                if self.videoManager.channelListChanged:
+                    self.tvhChangedEvents = set()
+                    self.tvhEventsCreated = False
+                    self.fetchEpgData(errorType=bugManager.tvhNotifications)
+            if self.tvhEventsCreated or len(self.tvhChangedEvents) > 0:
+                if self.tvhEventsCreated:
+                    keys = list(self.epgRows.keys())
+                else:
+                    keys = self.getEventChannels(self.tvhChangedEvents)
+                self.tvhChangedEvents = set()
+                self.tvhEventsCreated = False
+                if len(keys) > 0:
+                    self.epgReloadKeys.update(keys)
+                    self.updateEpgDataTvh(keys, errorType=bugManager.tvhNotifications)
+                    self.startScheduleTimer()
+            bugManager.pop(bugManager.tvhNotifications)
+        except:
+            bugManager.setError(bugManager.tvhNotifications)
+
+    # Channel list of remote playlist has changed: EPG is set up again
+    def updateChannelList(self):
+        try:
+            bugManager.push(bugManager.epgManager,'updateChannelList')
+            self.fetchEpgData(errorType=bugManager.epgManager)
+            bugManager.pop(bugManager.epgManager)
+        except:
+            bugManager.setError(bugManager.epgManager)
+
+    # Get keys of channels in channelList with the given event ids
+    def getEventChannels(self, eventIds):
+        return [key for key in self.epgStore.getEventKeys(eventIds) if key in self.epgRows]
+
+    # Shut down worker pool and save EPG cache
+    def shutdown(self):
+        if self.epgManagerOk:
+            self.epgGeneration += 1
+            self.updateEpgTimer.stop()
+            self.tvhNotificationTimer.stop()
+            if self.tvhCometListener != None:
+                self.tvhCometListener.stop()
+                self.tvhCometListener = None
+            self.epgPool.shutdown(wait=False, cancel_futures=True)
+            if self.configManager.getSource() == 'tvh':
+                self.saveEpgCache(self.epgStore.snapshot(), self.configManager.getTvhServer()['url'])
     
 # class HelpManager
 class HelpManager():
@@ -3164,6 +5863,87 @@ class InfoDialog(QtWidgets.QDialog):
     def closeDialog(self):
             self.close()
 
+# class EpgSearchDialog
+# Non modal dialog for full-text search of EPG events: Results are updated while typing
+# Double click or Return on a result starts streaming the channel
+class EpgSearchDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None, epgManager=None, language='de'):
+        super().__init__(parent)
+        self.parent = parent
+        self.epgManager = epgManager
+        self.language = language
+        if language == 'en':
+            self.weekDays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+            self.setWindowTitle('Search Programme')
+        else:
+            self.weekDays = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+            self.setWindowTitle('Sendung suchen')
+        # Setup UI
+        self.setWindowFlags(QtCore.Qt.WindowType.Dialog)
+        self.resize(int(550*scalingFactor), int(400*scalingFactor))
+        self.setFont(cyberTellyApp.font())
+        self.verticalLayout = QtWidgets.QVBoxLayout(self)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        # QLineEdit leSearch
+        self.leSearch = QtWidgets.QLineEdit(self)
+        self.leSearch.setObjectName(u"leSearch")
+        self.leSearch.setPlaceholderText('Title, subtitle, description' if language == 'en' else 'Titel, Untertitel, Beschreibung')
+        self.leSearch.setClearButtonEnabled(True)
+        self.verticalLayout.addWidget(self.leSearch)
+        # QListWidget lwResults
+        self.lwResults = QtWidgets.QListWidget(self)
+        self.lwResults.setObjectName(u"lwResults")
+        self.lwResults.setUniformItemSizes(True)
+        self.verticalLayout.addWidget(self.lwResults)
+        # QLabel lbCount
+        self.lbCount = QtWidgets.QLabel(self)
+        self.lbCount.setObjectName(u"lbCount")
+        self.verticalLayout.addWidget(self.lbCount)
+        self.leSearch.textChanged.connect(self.search)
+        self.leSearch.returnPressed.connect(self.playSelectedResult)
+        self.lwResults.itemActivated.connect(self.playResult)
+        self.leSearch.setFocus()
+
+    # Search EPG and show results
+    def search(self, text):
+        try:
+            bugManager.push(bugManager.epgManager,'EpgSearchDialog.search')
+            self.lwResults.clear()
+            results = self.epgManager.searchEpg(text)
+            now = time.time()
+            for row, channelName, event in results:
+                start = datetime.fromtimestamp(event.get('start', 0))
+                if event.get('start', 0) <= now:
+                    timeText = ('Now' if self.language == 'en' else 'Jetzt') + ' ' + start.strftime('%H:%M')
+                else:
+                    timeText = self.weekDays[start.weekday()] + ' ' + start.strftime('%H:%M')
+                title = str(event.get('title') or '')
+                if event.get('subtitle'):
+                    title += ' - ' + str(event['subtitle'])
+                item = QtWidgets.QListWidgetItem(timeText.ljust(12) + channelName + ': ' + title)
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, row)
+                if event.get('description'):
+                    item.setToolTip(str(event['description']))
+                self.lwResults.addItem(item)
+            if len(results) > 0:
+                self.lwResults.setCurrentRow(0)
+            if len(text.strip()) > 0:
+                self.lbCount.setText(str(len(results)) + (' results' if self.language == 'en' else ' Treffer'))
+            else:
+                self.lbCount.setText('')
+            bugManager.pop(bugManager.epgManager)
+        except:
+            bugManager.setError(bugManager.epgManager)
+
+    # Start streaming channel of result
+    def playResult(self, item):
+        if item != None and self.parent != None:
+            self.parent.playEpgSearchResult(item.data(QtCore.Qt.ItemDataRole.UserRole))
+
+    # Start streaming channel of selected result (Return in search field)
+    def playSelectedResult(self):
+        self.playResult(self.lwResults.currentItem())
+
 # class AboutDialog
 class AboutDialog(QtWidgets.QDialog):
     def __init__(self, parent=None, language='de'):
@@ -3242,6 +6022,15 @@ class BugManager():
         self.closeWindowTimer = 14
         self.updateEpgTimer = 15
         self.vlcCheckAliveTimer = 16
+        self.epgWorker = 17
+        self.tvhNotifications = 18
+        self.logoManager = 19
+        self.logoWorker = 20
+        self.streamProber = 21
+        self.probeWorker = 22
+        self.hlsWorker = 23
+        self.vlcEvents = 24
+        self.vlcCommands = 25
         # Create error dictionary and set basic vars
         self.errorDic = self.createErrorDic()
         self.fatalErrorOccured = False
@@ -3405,6 +6194,78 @@ class BugManager():
                 'maxExcept': 5,
                 'maxNotify': 5,
                 'infoStack' : []
+            },
+            self.epgWorker: {
+                'name': 'Thread: EPG Worker',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.tvhNotifications: {
+                'name': 'Thread: TVH Notifications',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.logoManager: {
+                'name': 'Class: LogoManager',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.logoWorker: {
+                'name': 'Thread: Logo Worker',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.streamProber: {
+                'name': 'Class: StreamProber',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.probeWorker: {
+                'name': 'Thread: Probe Worker',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.hlsWorker: {
+                'name': 'Thread: HLS Worker',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.vlcEvents: {
+                'name': 'Signal: VLC Player Events',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
+            },
+            self.vlcCommands: {
+                'name': 'Thread: VLC Command Router',
+                'exceptCnt': 0,
+                'notifyCnt': 0,
+                'maxExcept': 100,
+                'maxNotify': 100,
+                'infoStack' : []
             }
         }
         return errorDic
@@ -3483,6 +6344,14 @@ class BugManager():
                 if errType == self.systemInfo:
                     for line in self.errorDic[errType]:
                         f.write('\n'+line)    
+                    if tvhClient != None and len(tvhClient.stats) > 0:
+                        f.write('\n\nTVHeadend API:')
+                        for line in tvhClient.getStatsInfo():
+                            f.write('\n  ' + line)
+                    if httpClient != None and len(httpClient.stats) > 0:
+                        f.write('\n\nHTTP:')
+                        for line in httpClient.getStatsInfo():
+                            f.write('\n  ' + line)
                 else:
                     errDic = self.errorDic[errType]
                     f.write('\n\n' + 'Source.....: '+ errDic['name'] + '\n')
@@ -3625,6 +6494,140 @@ def fitSansSerifFont2PxWidth(text, targetWidth):
     font.setPointSizeF(ptSizeLo)
     return font
 
+# Detect encoding of a text file from its BOM or a sample: utf-8 if the sample is valid utf-8, otherwise cp1252 (ANSI)
+def detectTextEncoding(path, sampleSize=65536):
+    with open(path, 'rb') as f:
+        sample = f.read(sampleSize)
+    for bom, encoding in [(codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')]:
+        if sample.startswith(bom):
+            return encoding
+    if len(sample) == sampleSize and sample.rfind(b'\n') > 0:
+        sample = sample[:sample.rfind(b'\n')] # Don't cut a multibyte character
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+# Parse m3u playlist: Generator of channels { 'name', 'url', attributes of #EXTINF, 'groups', 'vlcopts' }
+# The file is read line by line through a buffer of chunkSize bytes, so memory does not grow with the file size.
+# Attribute names are lower case, group-title and #EXTGRP are stored as list 'groups', #EXTVLCOPT lines as list 'vlcopts'.
+# Attributes of the #EXTM3U header (e.g. url-tvg) are stored in header.
+def parseM3u(path, header=None, chunkSize=1048576):
+    encoding = detectTextEncoding(path)
+    with open(path, 'r', encoding=encoding, errors='replace', buffering=chunkSize) as f:
+        channel = None
+        for line in f:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            if line[0] != '#':
+                if channel != None:
+                    channel['url'] = line
+                    yield channel
+                    channel = None
+            elif line.startswith('#EXTINF:'):
+                channel = parseExtinf(line)
+            elif channel != None and line.startswith('#EXTVLCOPT:'):
+                channel.setdefault('vlcopts', []).append(line[len('#EXTVLCOPT:'):].strip())
+            elif channel != None and line.startswith('#EXTGRP:') and 'groups' not in channel:
+                channel['groups'] = [sys.intern(group.strip()) for group in line[len('#EXTGRP:'):].split(';') if len(group.strip()) > 0]
+            elif line.startswith('#EXTM3U') and header != None:
+                for key, value in m3uAttributes.findall(line):
+                    header[key.lower()] = value
+
+# Parse #EXTINF line: -1 tvg-id="..." group-title="...",Channel name
+# The name follows the first comma after the attributes, so commas in attributes and names are kept.
+# Returns channel without url or None if the line has no name
+def parseExtinf(line):
+    info = line[len('#EXTINF:'):]
+    channel = {}
+    end = 0
+    for match in m3uAttributes.finditer(info):
+        end = match.end()
+        key = sys.intern(match.group(1).lower())
+        value = match.group(2).strip()
+        if len(value) == 0 or key in ['name', 'url', 'groups', 'vlcopts']:
+            continue
+        if key == 'group-title':
+            channel['groups'] = [sys.intern(group.strip()) for group in value.split(';') if len(group.strip()) > 0]
+        else:
+            channel[key] = value
+    comma = info.find(',', end)
+    name = info[comma + 1:].strip() if comma >= 0 else ''
+    if len(name) == 0:
+        name = channel.get('tvg-name', '')
+    if len(name) == 0:
+        return None
+    channel['name'] = name
+    return channel
+
+# Detect playlist url (http://, https://) in the list of m3u files
+def isM3uUrl(m3uFile):
+    return str(m3uFile).strip().lower().startswith(('http://', 'https://'))
+
+# Merge channel lists of several playlists in priority order: [channels, ...] -> channels
+# Duplicates are detected in a single pass by hash indexes: The same stream url anywhere or
+# a tvg-id of a playlist with higher priority (channel variants of one playlist may share a tvg-id)
+def mergeM3uChannels(playlists):
+    if len(playlists) == 1:
+        return list(playlists[0])
+    channels = []
+    urls = set()
+    tvgIds = set()
+    for playlist in playlists:
+        playlistIds = set()
+        for channel in playlist:
+            url = channel.get('url', '')
+            tvgId = channel.get('tvg-id', '').strip().lower()
+            if url in urls or (len(tvgId) > 0 and tvgId in tvgIds):
+                continue
+            urls.add(url)
+            if len(tvgId) > 0:
+                playlistIds.add(tvgId)
+            channels.append(channel)
+        tvgIds |= playlistIds
+    return channels
+
+# Get variants of an HLS master playlist: [(bandwidth, absolute url), ...], [] if text is no master playlist
+def parseHlsVariants(text, baseUrl):
+    variants = []
+    bandwidth = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            match = re.search(r'[:,]BANDWIDTH=(\d+)', line)
+            bandwidth = int(match.group(1)) if match else 0
+        elif len(line) > 0 and not line.startswith('#') and bandwidth != None:
+            variants.append((bandwidth, urljoin(baseUrl, line)))
+            bandwidth = None
+    return variants
+
+# Check if an HLS master playlist has separate renditions (#EXT-X-MEDIA with URI), e.g. audio or subtitle groups
+def hasHlsRenditions(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('#EXT-X-MEDIA:') and re.search(r'[:,]URI=', line):
+            return True
+    return False
+
+# Normalize channel name for name based lookups: lower case, without blanks and punctuation
+def normalizeChannelName(name):
+    return ''.join(c for c in str(name).lower() if c.isalnum())
+
+# Convert XMLTV time (e.g. '20260101201500 +0100') to unix timestamp
+def parseXmltvTime(xmltvTime):
+    timestamp = 0
+    try:
+        parts = xmltvTime.strip().split()
+        if len(parts) > 1:
+            timestamp = datetime.strptime(parts[0][:14] + parts[1], '%Y%m%d%H%M%S%z').timestamp()
+        else:
+            timestamp = datetime.strptime(parts[0][:14], '%Y%m%d%H%M%S').timestamp()
+    except:
+        timestamp = 0
+    return timestamp
+
 # Set all necessary path vars
 # Returns different results, if program is run from either a virtual environment or a pyinstaller package
 def setProgPaths():
@@ -3806,6 +6809,9 @@ if __name__ == "__main__":
     installType = getInstallationType()
     errorDic = readErrorDic()
     bugManager = BugManager()
+    vlcClient = VlcCommandClient(cmdQueue, statusQueue)
+    tvhClient = TvhClient()
+    httpClient = HttpClient()
     try:
         # Linux: Set QPA Plugin to X11 or XWayland
         if platform.system() == "Linux":
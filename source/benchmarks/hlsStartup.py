@@ -0,0 +1,80 @@
+# Benchmark: Startup of HLS channels with and without HlsResolver
+# A local HLS stand-in (master, variant and media playlists, segments) answers every request after LATENCY seconds.
+# The player start is simulated as the request chain until the first segment arrives:
+#   unresolved: master -> media playlist -> segment, resolved (cached variant): media playlist -> segment
+# Usage: python benchmarks/hlsStartup.py [latency in ms] [runs]
+import sys, time, statistics
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urljoin
+import requests
+from standIn import CyberTelly, setupGlobals, cleanupGlobals, startServer
+
+LATENCY = int(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.08
+RUNS = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+masterPlaylist = b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\nlow/index.m3u8\n' \
+                 b'#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080\nhigh/index.m3u8\n' \
+                 b'#EXT-X-STREAM-INF:BANDWIDTH=2500000\nmid/index.m3u8\n'
+mediaPlaylist = b'#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4,\nseg1.ts\n'
+
+# HLS stand-in
+class HlsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if self.path.endswith('/master.m3u8'):
+            body = masterPlaylist
+        elif self.path.endswith('/index.m3u8'):
+            body = mediaPlaylist
+        elif self.path.endswith('.ts'):
+            body = b'\x47' * 188 * 50
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+# Simulated player start: Follow playlists until the first segment is loaded, returns seconds
+def startup(session, url):
+    startTime = time.perf_counter()
+    while True:
+        response = session.get(url)
+        if not response.content.startswith(b'#EXTM3U'):
+            return time.perf_counter() - startTime
+        text = response.content.decode()
+        variants = CyberTelly.parseHlsVariants(text, response.url)
+        if len(variants) > 0:
+            url = sorted(variants)[-1][1]
+        else:
+            url = urljoin(response.url, [line for line in text.splitlines() if line and not line.startswith('#')][0])
+
+if __name__ == '__main__':
+    setupGlobals()
+    server, baseUrl = startServer(HlsHandler)
+
+    session = requests.Session()
+    resolver = CyberTelly.HlsResolver()
+    unresolvedTimes = []
+    resolvedTimes = []
+    for run in range(RUNS):
+        masterUrl = '%s/ch%d/master.m3u8' % (baseUrl, run)
+        unresolvedTimes.append(startup(session, masterUrl))
+        resolver.prefetch([masterUrl])
+        waitStart = time.time()
+        while resolver.resolve(masterUrl) == masterUrl and time.time() - waitStart < 5:
+            time.sleep(0.005)
+        resolvedTimes.append(startup(session, resolver.resolve(masterUrl)))
+    resolver.shutdown()
+    server.shutdown()
+    cleanupGlobals()
+    print('Latency per request: %d ms, runs: %d' % (LATENCY * 1000, RUNS))
+    print('Startup unresolved (median): %.0f ms' % (statistics.median(unresolvedTimes) * 1000))
+    print('Startup resolved (median):   %.0f ms' % (statistics.median(resolvedTimes) * 1000))
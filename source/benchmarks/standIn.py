@@ -0,0 +1,27 @@
+# Helpers of the benchmarks: Globals of the CyberTelly main program and local HTTP stand-ins
+import os, sys, tempfile, shutil, threading
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import CyberTelly
+
+# Set up globals of the main program, configPath is a temporary folder (see cleanupGlobals)
+def setupGlobals():
+    CyberTelly.configPath = tempfile.mkdtemp(prefix='CyberTelly-benchmark-')
+    CyberTelly.resourcePath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+    CyberTelly.sysLanguage = 'en'
+    CyberTelly.errorDic = CyberTelly.readErrorDic()
+    os.environ.setdefault('XDG_SESSION_TYPE', 'benchmark') # Read by the system info of BugManager on Linux
+    CyberTelly.bugManager = CyberTelly.BugManager()
+    CyberTelly.tvhClient = CyberTelly.TvhClient()
+    CyberTelly.httpClient = CyberTelly.HttpClient()
+
+# Remove temporary configPath
+def cleanupGlobals():
+    shutil.rmtree(CyberTelly.configPath, ignore_errors=True)
+
+# Start HTTP stand-in with request handler class: Returns server and base url
+def startServer(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, 'http://127.0.0.1:%d' % server.server_address[1]
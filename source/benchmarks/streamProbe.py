@@ -0,0 +1,90 @@
+# Check and benchmark: StreamProber against a local stream stand-in
+# The stand-in serves a plain stream, an HLS master > media playlist > segment chain, a master with a missing
+# variant, a missing stream and a stream answering after the probe timeout. Every request takes LATENCY seconds.
+# Results and time to first byte of each url are printed, a wrong result raises AssertionError.
+# Usage: python benchmarks/streamProbe.py [latency in ms]
+import sys, time, json, glob
+from http.server import BaseHTTPRequestHandler
+from PySide6 import QtCore
+from standIn import CyberTelly, setupGlobals, cleanupGlobals, startServer
+
+LATENCY = int(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.05
+TIMEOUT = 1
+
+playlists = {
+    '/hls/master.m3u8': b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=800000\nlow/index.m3u8\n',
+    '/hls/low/index.m3u8': b'#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4,\n/segments/seg1.ts\n',
+    '/broken/master.m3u8': b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=800000\nmissing/index.m3u8\n'
+}
+
+# Stream stand-in
+class StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    # The prober closes connections after the first bytes
+    def handle(self):
+        try:
+            super().handle()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if self.path in playlists:
+            body = playlists[self.path]
+        elif self.path == '/slow.ts':
+            time.sleep(TIMEOUT * 2)
+            body = b'\x47' * 188
+        elif self.path.endswith('.ts') and not self.path.startswith('/dead'):
+            body = b'\x47' * 188 * 50
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+if __name__ == '__main__':
+    app = QtCore.QCoreApplication(sys.argv)
+    setupGlobals()
+    server, baseUrl = startServer(StreamHandler)
+    prober = CyberTelly.StreamProber()
+    prober.timeout = TIMEOUT
+
+    # getHlsUri: First uri of a playlist, relative uris are resolved against the playlist url
+    assert prober.getHlsUri(b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1\nlow/index.m3u8\n', 'http://h/a/master.m3u8') == 'http://h/a/low/index.m3u8'
+    assert prober.getHlsUri(b'#EXTM3U\n#EXTINF:4,\nhttp://cdn/seg.ts\n', 'http://h/a/index.m3u8') == 'http://cdn/seg.ts'
+    assert prober.getHlsUri(b'#EXTM3U\n#EXT-X-ENDLIST\n', 'http://h/a/index.m3u8') == None
+
+    # probeUrl: { path: expected ok }
+    expected = {'/live.ts': True, '/hls/master.m3u8': True, '/broken/master.m3u8': False, '/dead.ts': False, '/slow.ts': False}
+    for path, ok in expected.items():
+        startTime = time.perf_counter()
+        result = prober.probeUrl(baseUrl + path)
+        print('%-20s ok=%-5s status=%-3s ttfb=%-5s ms probe=%4.0f ms' % (path, result['ok'], result['status'], result['ttfb'], (time.perf_counter() - startTime) * 1000))
+        assert result['ok'] == ok, path
+
+    # Failed urls expire after maxFailedAge, healthy urls after maxAge
+    now = time.time()
+    assert prober.isExpired(None)
+    assert not prober.isExpired({'ok': True, 'time': now - prober.maxFailedAge - 1})
+    assert prober.isExpired({'ok': False, 'time': now - prober.maxFailedAge - 1})
+    assert prober.isExpired({'ok': True, 'time': now - prober.maxAge - 1})
+
+    # Shutdown while a timer save is running or queued: probe.json is complete, no temporary files are left
+    prober.results = {baseUrl + '/%d.ts' % i: {'ok': True, 'ttfb': 1, 'status': 200, 'time': int(now)} for i in range(20000)}
+    prober.saveResults()
+    prober.shutdown()
+    with open(prober.probeFile, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 20000
+    assert len(glob.glob(prober.probeFile + '.*.tmp')) == 0
+
+    server.shutdown()
+    cleanupGlobals()
+    print('StreamProber checks passed')